@@ -1,4 +1,5 @@
 import asyncio
+import aiohttp
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
 import discord
@@ -11,13 +12,31 @@ import logging
 import json
 import re
 import time  # For rate limiting
+import io
 from flask import Flask
 from threading import Thread
-import requests
 from apscheduler.triggers.cron import CronTrigger
 from apscheduler.triggers.interval import IntervalTrigger
+from apscheduler.triggers.calendarinterval import CalendarIntervalTrigger
+from apscheduler.jobstores.memory import MemoryJobStore
+from apscheduler.jobstores.sqlalchemy import SQLAlchemyJobStore
+from apscheduler.jobstores.base import JobLookupError
 from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import hashlib
+import zlib
+import numpy as np
+import bisect
+import string
+import heapq
+import sys
+import atexit
+import signal
+import sqlite3
+from collections import OrderedDict
+from collections.abc import MutableMapping
+import sqlalchemy
+import tzlocal
 
 # ---------------------------
 # Logging Configuration
@@ -37,10 +56,90 @@ logging.basicConfig(
 load_dotenv()
 TOKEN = os.getenv("DISCORD_TOKEN")
 GROQ_API_KEY = os.getenv("GROQ_API_KEY")
-GROQ_API_URL = "https://api.groq.com/openai/v1/chat/completions"
-GIFT_CODE_URL = "https://wos-giftcode-api.centurygame.com/api/gift_code"  
-PLAYER_INFO_URL = "https://wos-giftcode-api.centurygame.com/api/player"
+GROQ_API_URL = os.getenv("GROQ_API_URL", "https://api.groq.com/openai/v1/chat/completions")
+GROQ_MODEL = os.getenv("GROQ_MODEL", "llama-3.3-70b-versatile")
+GROQ_TIMEOUT_SECONDS = float(os.getenv("GROQ_TIMEOUT_SECONDS", 30))
+PROFILE_BATCH_SIZE = int(os.getenv("PROFILE_BATCH_SIZE", 1))             # Members per Groq prompt, 1 disables batching
+PROFILE_BATCH_WINDOW_MS = int(os.getenv("PROFILE_BATCH_WINDOW_MS", 250))  # How long a batch waits to fill up
+PROFILE_WARMUP_INTERVAL_MINUTES = int(os.getenv("PROFILE_WARMUP_INTERVAL_MINUTES", 10))  # How often the warm-up worker wakes up
+PROFILE_WARMUP_CONCURRENCY = int(os.getenv("PROFILE_WARMUP_CONCURRENCY", 2))             # Warm-up generations in flight
+PROFILE_WARMUP_DAILY_BUDGET = int(os.getenv("PROFILE_WARMUP_DAILY_BUDGET", 100))         # Warm-up generations per day
+PROFILE_WARMUP_IDLE_SECONDS = int(os.getenv("PROFILE_WARMUP_IDLE_SECONDS", 60))          # Quiet time required before warming up
+WOS_API_URL = os.getenv("WOS_API_URL", "https://wos-giftcode-api.centurygame.com/api")
+GIFT_CODE_URL = f"{WOS_API_URL}/gift_code"
+PLAYER_INFO_URL = f"{WOS_API_URL}/player"
 SECRET_KEY = os.getenv('SECRET_KEY')
+
+# ---------------------------
+# Gift Code Redemption Settings
+# ---------------------------
+GIFT_CODE_CONCURRENCY = int(os.getenv("GIFT_CODE_CONCURRENCY", 5))            # Players redeemed in parallel
+WOS_API_RATE_PER_SECOND = float(os.getenv("WOS_API_RATE_PER_SECOND", 5))      # Sustained requests per second
+WOS_API_BURST = int(os.getenv("WOS_API_BURST", 10))                           # Requests allowed in a burst
+WOS_API_MAX_RETRIES = int(os.getenv("WOS_API_MAX_RETRIES", 3))                # Retries on transient errors
+WOS_API_BACKOFF_SECONDS = float(os.getenv("WOS_API_BACKOFF_SECONDS", 1))      # Base delay for exponential backoff
+HTTP_TIMEOUT_SECONDS = float(os.getenv("HTTP_TIMEOUT_SECONDS", 10))
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", 20))
+
+# ---------------------------
+# Player Info Cache Settings
+# ---------------------------
+PLAYER_CACHE_TTL_SECONDS = float(os.getenv("PLAYER_CACHE_TTL_SECONDS", 300))      # Fresh for this long
+PLAYER_CACHE_STALE_SECONDS = float(os.getenv("PLAYER_CACHE_STALE_SECONDS", 3600))  # Then served while refreshing
+PLAYER_CACHE_MAX_BYTES = int(os.getenv("PLAYER_CACHE_MAX_BYTES", 4 * 1024 * 1024))  # LRU eviction above this
+ROSTER_SYNC_INTERVAL_MINUTES = float(os.getenv("ROSTER_SYNC_INTERVAL_MINUTES", 60))  # Full roster refresh period
+ROSTER_SYNC_CONCURRENCY = int(os.getenv("ROSTER_SYNC_CONCURRENCY", 3))                # Players fetched in parallel
+ROSTER_SYNC_RATE_PER_SECOND = float(os.getenv("ROSTER_SYNC_RATE_PER_SECOND", 2))     # Leaves room for commands
+
+# ---------------------------
+# Matchmaking Settings
+# ---------------------------
+MATCH_DM_CONCURRENCY = int(os.getenv("MATCH_DM_CONCURRENCY", 3))  # Match DMs delivered in parallel
+MATCH_DM_MAX_RETRIES = int(os.getenv("MATCH_DM_MAX_RETRIES", 3))  # Retries for a failed match DM
+RECOMMENDER_FEATURE_DIM = int(os.getenv("RECOMMENDER_FEATURE_DIM", 256))  # Hashed text features per profile
+CO_LIKE_WEIGHT = float(os.getenv("CO_LIKE_WEIGHT", 0.3))                    # Weight of co-likes in /findmatches
+CO_LIKE_REBUILD_HOURS = float(os.getenv("CO_LIKE_REBUILD_HOURS", 6))        # Full co-like rebuild period
+
+# ---------------------------
+# DM Campaign Settings
+# ---------------------------
+DM_CAMPAIGN_CONCURRENCY = int(os.getenv("DM_CAMPAIGN_CONCURRENCY", 3))           # Campaign DMs in flight
+DM_CAMPAIGN_RATE_PER_SECOND = float(os.getenv("DM_CAMPAIGN_RATE_PER_SECOND", 1))  # Sustained DMs per second
+
+# ---------------------------
+# Birthday Settings
+# ---------------------------
+BIRTHDAY_ANNOUNCE_TIME = os.getenv("BIRTHDAY_ANNOUNCE_TIME", "09:00")  # Local time (HH:MM) of birthday announcements
+
+# ---------------------------
+# Scheduler Settings
+# ---------------------------
+SCHEDULER_DB_FILE = os.getenv("SCHEDULER_DB_FILE", "scheduler.db")                          # Persistent job store
+SCHEDULER_MISFIRE_GRACE_SECONDS = int(os.getenv("SCHEDULER_MISFIRE_GRACE_SECONDS", 300))    # Late runs still allowed
+SCHEDULER_COALESCE = os.getenv("SCHEDULER_COALESCE", "true").lower() == "true"               # Run missed runs once
+EVENT_SEND_CONCURRENCY = int(os.getenv("EVENT_SEND_CONCURRENCY", 5))                         # Channels notified in parallel
+DEFAULT_TIMEZONE = os.getenv("DEFAULT_TIMEZONE", "UTC")                                        # New events in guilds without /set_timezone
+GAME_RESET_TIME = os.getenv("GAME_RESET_TIME", "00:00")                                        # Daily game server reset (HH:MM)
+GAME_RESET_TIMEZONE = os.getenv("GAME_RESET_TIMEZONE", "UTC")                                  # Timezone of GAME_RESET_TIME
+EVENT_CALENDAR_DAYS = int(os.getenv("EVENT_CALENDAR_DAYS", 8))                                 # How far ahead occurrences are precomputed
+EVENT_CALENDAR_PER_EVENT = int(os.getenv("EVENT_CALENDAR_PER_EVENT", 50))                      # Max precomputed occurrences per event
+EVENT_IMPORT_MAX_ROWS = int(os.getenv("EVENT_IMPORT_MAX_ROWS", 1000))                             # Events accepted by one /import_events
+
+# ---------------------------
+# Persistence Settings
+# ---------------------------
+FLUSH_INTERVAL_MS = int(os.getenv("FLUSH_INTERVAL_MS", 2000))  # Max delay between a change and its flush to disk
+FLUSH_MAX_PENDING = int(os.getenv("FLUSH_MAX_PENDING", 50))    # Changes that force an early flush
+STORAGE_BACKEND = os.getenv("STORAGE_BACKEND", "json").lower()  # "json" files or a "sqlite" database
+SQLITE_DB_FILE = os.getenv("SQLITE_DB_FILE", "bot.db")
+
+ID_MAP_FILE = "id_map.json"
+CACHE_FILE = "profile_cache.json"
+LIKES_CACHE_FILE = "likes_cache.json"
+EVENTS_FILE = "events.json"
+EVENTS_JOURNAL_FILE = "events_journal.jsonl"  # Event changes since events.json was last written
+ROSTER_FILE = "roster.json"
+GUILD_SETTINGS_FILE = "guild_settings.json"
 # ---------------------------
 # Required Profile Keys
 # ---------------------------
@@ -114,33 +213,122 @@ BIRTHDAYS = {
     "December 22": ["CherryPick"]
 }
 
-# Load or initialize the ID map
-ID_MAP_FILE = "id_map.json"
+# ---------------------------
+# Write-behind Persistence
+# ---------------------------
+background_tasks = set()  # The loop only keeps weak references to tasks; these must run to the end
 
-try:
-    with open(ID_MAP_FILE, "r") as f:
-        user_id_map = json.load(f)
-except FileNotFoundError:
-    user_id_map = {}  # { "discord_id": game_id }
+def create_background_task(coro):
+    """create_task for fire-and-forget work, holding a reference until the task finishes."""
+    task = asyncio.create_task(coro)
+    background_tasks.add(task)
+    task.add_done_callback(background_tasks.discard)
+    return task
+
+def write_file_atomic(path, payload):
+    """Writes `payload` to a temp file and renames it over `path`, so readers never see half a file."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as f:
+        f.write(payload)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+class WriteBehindStore:
+    """Persists an in-memory dict as JSON, coalescing many mutations into one flush.
+
+    Callers mutate the dict and call mark_dirty(). The dict is flushed FLUSH_INTERVAL_MS
+    after the first unflushed change, or right away once FLUSH_MAX_PENDING changes pile up.
+    The file is written atomically in a worker thread, off the event loop.
+    """
+
+    def __init__(self, name, path, data):
+        self.name = name
+        self.path = path
+        self.data = data
+        self.pending = 0   # Mutations since the last flush
+        self.timer = None
+        self.lock = None   # Created lazily so it binds to the running event loop
+
+    def mark_dirty(self):
+        self.pending += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return  # Not running yet (startup); written by the next flush or on shutdown
+        if self.pending >= FLUSH_MAX_PENDING:
+            self._cancel_timer()
+            create_background_task(self.flush())
+        else:
+            self._arm_timer(loop)
+
+    def _arm_timer(self, loop):
+        if self.timer is None:
+            self.timer = loop.call_later(FLUSH_INTERVAL_MS / 1000, lambda: create_background_task(self.flush()))
+
+    def _cancel_timer(self):
+        if self.timer:
+            self.timer.cancel()
+            self.timer = None
+
+    async def flush(self):
+        self._cancel_timer()
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        # One flush at a time, so an older snapshot can never overwrite a newer one
+        async with self.lock:
+            if not self.pending:
+                return
+            pending, self.pending = self.pending, 0
+            # Serialize on the loop so the snapshot is consistent; only the disk I/O is offloaded
+            payload = json.dumps(self.data)
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, write_file_atomic, self.path, payload)
+            except OSError as e:
+                self.pending += pending
+                logging.error(f"❌ Failed to save {self.name}: {e}")
+                self._arm_timer(asyncio.get_running_loop())  # Retry later even if nothing else changes
+                return
+            logging.info(f"{self.name} saved ({pending} changes).")
+
+    def flush_sync(self):
+        """Blocking flush for startup and interpreter shutdown, when there is no loop to offload to."""
+        self._cancel_timer()
+        if not self.pending:
+            return
+        write_file_atomic(self.path, json.dumps(self.data))
+        logging.info(f"{self.name} saved ({self.pending} changes).")
+        self.pending = 0
+
+persistent_stores = []
+
+def open_store(name, path, data):
+    store = WriteBehindStore(name, path, data)
+    persistent_stores.append(store)
+    return store
+
+async def flush_all_stores():
+    for store in persistent_stores:
+        await store.flush()
+
+def flush_all_stores_sync():
+    for store in persistent_stores:
+        try:
+            store.flush_sync()
+        except OSError as e:
+            logging.error(f"❌ Failed to save {store.name}: {e}")
+
+# Last line of defence if the bot dies without going through close().
+# SIGTERM skips atexit, so WhiteoutBot.setup_hook turns it into a clean close() instead.
+atexit.register(flush_all_stores_sync)
 
-# Function to save ID map
-def save_id_map():
-    with open(ID_MAP_FILE, "w") as f:
-        json.dump(user_id_map, f, indent=4)
 # ---------------------------
-# Initialize and Validate Profile Cache
+# Cached Profile Validation
 # ---------------------------
-profile_cache = {}
-CACHE_FILE = "profile_cache.json"
-birthday_channel_id= None
-if os.path.exists(CACHE_FILE):
-    with open(CACHE_FILE, "r") as f:
-        profile_cache = json.load(f)
-    logging.info("Profile cache loaded.")
-    
-    # Validate and update existing profiles
+def validate_cached_profiles(profiles):
+    """Fills in missing or empty keys in place; returns True if anything changed."""
     updated = False
-    for member_id, profile in profile_cache.items():
+    for member_id, profile in profiles.items():
         for key in required_profile_keys:
             if key not in profile:
                 profile[key] = "N/A"  # Add missing key with a default value
@@ -153,46 +341,416 @@ if os.path.exists(CACHE_FILE):
             elif isinstance(profile[key], int):
                 # Ensure integer values are correctly handled; this might depend on your specific needs
                 pass  # Do nothing for now, but add logic if needed (e.g., range checks)
+    return updated
+
+# ---------------------------
+# SQLite Storage Engine (STORAGE_BACKEND=sqlite)
+# ---------------------------
+# SQLite is the persistence layer only: likes and events are loaded into LikeGraph and
+# EventRegistry at startup and queried in memory, so the tables need nothing but primary keys.
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS profiles (
+    member_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS likes (
+    liker_id TEXT NOT NULL,
+    likee_id TEXT NOT NULL,
+    PRIMARY KEY (liker_id, likee_id)
+) WITHOUT ROWID;
+CREATE TABLE IF NOT EXISTS id_map (
+    discord_id TEXT PRIMARY KEY,
+    game_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS events (
+    event_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS roster (
+    fid TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS guild_settings (
+    guild_id TEXT PRIMARY KEY,
+    data TEXT NOT NULL
+);
+"""
+
+class SqliteJsonMap(MutableMapping):
+    """Dict-like view of a table holding one JSON value per key.
+
+    Every operation is a primary-key query, so nothing is loaded up front.
+    Writes go straight to the database; values must be reassigned, not mutated in place.
+    """
+
+    def __init__(self, db, table, key_column, value_column):
+        self.db = db
+        self.table = table
+        self.key_column = key_column
+        self.value_column = value_column
+
+    def __getitem__(self, key):
+        row = self.db.execute(
+            f"SELECT {self.value_column} FROM {self.table} WHERE {self.key_column} = ?", (key,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return json.loads(row[0])
+
+    def __setitem__(self, key, value):
+        self.db.execute(
+            f"INSERT OR REPLACE INTO {self.table} ({self.key_column}, {self.value_column}) VALUES (?, ?)",
+            (key, json.dumps(value))
+        )
+
+    def update_many(self, items):
+        """Writes several (key, value) pairs in one transaction: all of them or none."""
+        self.db.execute("BEGIN")
+        try:
+            self.db.executemany(
+                f"INSERT OR REPLACE INTO {self.table} ({self.key_column}, {self.value_column}) VALUES (?, ?)",
+                [(key, json.dumps(value)) for key, value in items]
+            )
+            self.db.execute("COMMIT")
+        except Exception:
+            self.db.execute("ROLLBACK")
+            raise
+
+    def __delitem__(self, key):
+        if self.db.execute(f"DELETE FROM {self.table} WHERE {self.key_column} = ?", (key,)).rowcount == 0:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return self.db.execute(
+            f"SELECT 1 FROM {self.table} WHERE {self.key_column} = ?", (key,)
+        ).fetchone() is not None
+
+    def __iter__(self):
+        # Materialize the keys so callers can mutate the table while iterating
+        keys = self.db.execute(f"SELECT {self.key_column} FROM {self.table}").fetchall()
+        return iter([row[0] for row in keys])
+
+    def __len__(self):
+        return self.db.execute(f"SELECT COUNT(*) FROM {self.table}").fetchone()[0]
+
+    def items(self):
+        rows = self.db.execute(f"SELECT {self.key_column}, {self.value_column} FROM {self.table}").fetchall()
+        return [(key, json.loads(value)) for key, value in rows]
+
+    def values(self):
+        rows = self.db.execute(f"SELECT {self.value_column} FROM {self.table}").fetchall()
+        return [json.loads(row[0]) for row in rows]
+
+    def mark_dirty(self):
+        pass  # Written through on every change
+
+def read_json_file(path):
+    if os.path.exists(path):
+        with open(path, "r") as f:
+            return json.load(f)
+    return {}
+
+def load_events():
+    """events.json with the journaled changes since it was written replayed on top."""
+    events = read_json_file(EVENTS_FILE)
+    if os.path.exists(EVENTS_JOURNAL_FILE):
+        with open(EVENTS_JOURNAL_FILE, "r") as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logging.warning(f"Skipping malformed events journal line: {line.strip()}")
+                    continue
+                # A batch is one line, so a torn write drops the whole batch rather than part of it
+                for change in entry.get("batch", [entry]):
+                    if change["data"] is None:
+                        events.pop(change["event_id"], None)
+                    else:
+                        events[change["event_id"]] = change["data"]
+    return events
+
+def migrate_json_to_sqlite(db):
+    """One-shot import of the JSON files into the database, recorded in the meta table."""
+    if db.execute("SELECT 1 FROM meta WHERE key = 'migrated_from_json'").fetchone():
+        return
+
+    id_map = read_json_file(ID_MAP_FILE)
+    profiles = read_json_file(CACHE_FILE)
+    validate_cached_profiles(profiles)
+    likes = read_json_file(LIKES_CACHE_FILE)
+    events = load_events()
+
+    db.execute("BEGIN")
+    try:
+        db.executemany(
+            "INSERT OR REPLACE INTO id_map (discord_id, game_id) VALUES (?, ?)",
+            [(discord_id, json.dumps(game_id)) for discord_id, game_id in id_map.items()]
+        )
+        db.executemany(
+            "INSERT OR REPLACE INTO profiles (member_id, data) VALUES (?, ?)",
+            [(member_id, json.dumps(profile)) for member_id, profile in profiles.items()]
+        )
+        db.executemany(
+            "INSERT OR IGNORE INTO likes (liker_id, likee_id) VALUES (?, ?)",
+            [(liker_id, likee_id) for likee_id, likers in likes.items() for liker_id in likers]
+        )
+        db.executemany(
+            "INSERT OR REPLACE INTO events (event_id, data) VALUES (?, ?)",
+            [(event_id, json.dumps(data)) for event_id, data in events.items()]
+        )
+        db.execute("INSERT INTO meta (key, value) VALUES ('migrated_from_json', ?)", (datetime.now().isoformat(),))
+        db.execute("COMMIT")
+    except Exception:
+        db.execute("ROLLBACK")
+        raise
+    logging.info(
+        f"📦 Migrated JSON files to {SQLITE_DB_FILE}: {len(id_map)} ID mappings, {len(profiles)} profiles, "
+        f"{sum(len(likers) for likers in likes.values())} likes, {len(events)} events."
+    )
+
+def open_sqlite_db(path):
+    # Autocommit mode: each write is its own transaction unless BEGIN is issued explicitly
+    db = sqlite3.connect(path, isolation_level=None)
+    db.execute("PRAGMA journal_mode=WAL")
+    db.execute("PRAGMA synchronous=NORMAL")
+    db.executescript(SQLITE_SCHEMA)
+    migrate_json_to_sqlite(db)
+    logging.info(f"SQLite storage opened at {path}.")
+    return db
+
+sqlite_db = open_sqlite_db(SQLITE_DB_FILE) if STORAGE_BACKEND == "sqlite" else None
+
+# Load or initialize the ID map
+if sqlite_db:
+    user_id_map = SqliteJsonMap(sqlite_db, "id_map", "discord_id", "game_id")
+    id_map_store = user_id_map
+else:
+    try:
+        with open(ID_MAP_FILE, "r") as f:
+            user_id_map = json.load(f)
+    except FileNotFoundError:
+        user_id_map = {}  # { "discord_id": game_id }
+    id_map_store = open_store("ID map", ID_MAP_FILE, user_id_map)
+
+# Function to save ID map
+def save_id_map():
+    id_map_store.mark_dirty()
+
+# ---------------------------
+# Gift Code Redemption Ledger
+# ---------------------------
+# Append-only log of redemption outcomes, replayed into dicts at startup.
+# One JSON object per line: {"cdk": code, "fid": player_id, "status": status}
+# or {"cdk": code, "dead": true} once the game server reports CDK_NOT_FOUND.
+REDEMPTION_LEDGER_FILE = "redemption_ledger.jsonl"
+FINAL_REDEMPTION_STATUSES = {"SUCCESS", "ALREADY_RECEIVED"}
+
+redemption_ledger = {}   # { gift_code: { "player_id": status } }
+dead_gift_codes = set()  # Gift codes the game server does not know about
+
+def apply_ledger_entry(entry):
+    if entry.get("dead"):
+        dead_gift_codes.add(entry["cdk"])
+    else:
+        redemption_ledger.setdefault(entry["cdk"], {})[str(entry["fid"])] = entry["status"]
+
+if os.path.exists(REDEMPTION_LEDGER_FILE):
+    with open(REDEMPTION_LEDGER_FILE, "r") as f:
+        for line in f:
+            try:
+                apply_ledger_entry(json.loads(line))
+            except (json.JSONDecodeError, KeyError):
+                logging.warning(f"Skipping malformed redemption ledger line: {line.strip()}")
+    logging.info(f"Redemption ledger loaded ({len(redemption_ledger)} codes, {len(dead_gift_codes)} dead).")
+
+def append_ledger_entry(entry):
+    apply_ledger_entry(entry)
+    with open(REDEMPTION_LEDGER_FILE, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+def record_redemption(gift_code, player_id, status):
+    """Stores an outcome in the ledger; only final outcomes and dead codes are worth keeping."""
+    if status == "CDK_NOT_FOUND":
+        if gift_code not in dead_gift_codes:
+            append_ledger_entry({"cdk": gift_code, "dead": True})
+    elif status in FINAL_REDEMPTION_STATUSES:
+        append_ledger_entry({"cdk": gift_code, "fid": player_id, "status": status})
+
+def redemption_status(gift_code, player_id):
+    return redemption_ledger.get(gift_code, {}).get(str(player_id))
+# ---------------------------
+# Initialize and Validate Profile Cache
+# ---------------------------
+profile_cache = {}
+birthday_channel_id= None
+updated = False
+if sqlite_db:
+    profile_cache = SqliteJsonMap(sqlite_db, "profiles", "member_id", "data")
+elif os.path.exists(CACHE_FILE):
+    with open(CACHE_FILE, "r") as f:
+        profile_cache = json.load(f)
+    logging.info("Profile cache loaded.")
     
-    if updated:
-        with open(CACHE_FILE, "w") as f:
-            json.dump(profile_cache, f, indent=4)
-        logging.info("Profile cache updated with missing or corrected keys.")
+    # Validate and update existing profiles
+    updated = validate_cached_profiles(profile_cache)
 
 else:
     logging.info("No existing profile cache found. Starting fresh.")
 
+if sqlite_db:
+    profile_store = profile_cache
+else:
+    profile_store = open_store("Profile cache", CACHE_FILE, profile_cache)
+if updated:
+    profile_store.mark_dirty()
+    profile_store.flush_sync()
+    logging.info("Profile cache updated with missing or corrected keys.")
+
 # ---------------------------
 # Initialize Likes Cache
 # ---------------------------
-likes_cache = {}
-LIKES_CACHE_FILE = "likes_cache.json"
-EVENTS_FILE = "events.json"
+likes_cache = {}  # { likee_id: [liker_id, ...] }, unused with SQLite (see the likes table)
 
-if os.path.exists(LIKES_CACHE_FILE):
+if sqlite_db:
+    logging.info("Likes are read from the SQLite likes table.")
+elif os.path.exists(LIKES_CACHE_FILE):
     with open(LIKES_CACHE_FILE, "r") as f:
         likes_cache = json.load(f)
     logging.info("Likes cache loaded.")
 else:
     logging.info("No existing likes cache found. Starting fresh.")
 
+likes_store = open_store("Likes cache", LIKES_CACHE_FILE, likes_cache)
+
 def save_likes_cache():
-    with open(LIKES_CACHE_FILE, "w") as f:
-        json.dump(likes_cache, f, indent=4)
-    logging.info("Likes cache saved.")
+    likes_store.mark_dirty()
 
-# Load events from cache
-def load_events():
-    if os.path.exists(EVENTS_FILE):
-        with open(EVENTS_FILE, "r") as f:
-            return json.load(f)
-    return {}
+# ---------------------------
+# Event Registry
+# ---------------------------
+def event_channel_ids(data):
+    """Every channel an event posts to; events created before fan-out only have "channel_id"."""
+    return data.get("channel_ids") or [data.get("channel_id")]
+
+class EventRegistry:
+    """Scheduled events held in memory and indexed by guild and by channel.
+
+    Changes are handed to `persist(changes)` as a list of (event_id, data) deltas,
+    with data None for a removal; a batch from put_many is persisted in one call.
+    """
+
+    def __init__(self, events, persist):
+        self.events = {}      # { "guildid_eventname": event data }
+        self.by_guild = {}    # { guild_id: {event_id, ...} }
+        self.by_channel = {}  # { channel_id: {event_id, ...} }
+        self.persist = persist
+        for event_id, data in events.items():
+            self._index(event_id, data)
+
+    def _index(self, event_id, data):
+        self.events[event_id] = data
+        self.by_guild.setdefault(event_id.split("_", 1)[0], set()).add(event_id)
+        for channel_id in event_channel_ids(data):
+            self.by_channel.setdefault(str(channel_id), set()).add(event_id)
+
+    def _unindex(self, event_id):
+        data = self.events.pop(event_id)
+        keys = [(self.by_guild, event_id.split("_", 1)[0])]
+        keys += [(self.by_channel, str(channel_id)) for channel_id in event_channel_ids(data)]
+        for index, key in keys:
+            index[key].discard(event_id)
+            if not index[key]:
+                del index[key]
+        return data
+
+    def __contains__(self, event_id):
+        return event_id in self.events
+
+    def __len__(self):
+        return len(self.events)
+
+    def get(self, event_id):
+        return self.events.get(event_id)
+
+    def items(self):
+        return self.events.items()
+
+    def in_guild(self, guild_id):
+        return [(event_id, self.events[event_id]) for event_id in sorted(self.by_guild.get(str(guild_id), ()))]
+
+    def in_channel(self, channel_id):
+        return [(event_id, self.events[event_id]) for event_id in sorted(self.by_channel.get(str(channel_id), ()))]
+
+    def put(self, event_id, data):
+        if event_id in self.events:
+            self._unindex(event_id)
+        self._index(event_id, data)
+        self.persist([(event_id, data)])
+
+    def put_many(self, items):
+        if not items:
+            return
+        for event_id, data in items:
+            if event_id in self.events:
+                self._unindex(event_id)
+            self._index(event_id, data)
+        self.persist(items)
+
+    def remove(self, event_id):
+        data = self._unindex(event_id)
+        self.persist([(event_id, None)])
+        return data
+
+if sqlite_db:
+    scheduled_events = SqliteJsonMap(sqlite_db, "events", "event_id", "data")
+
+    def persist_events(changes):
+        removed = [event_id for event_id, data in changes if data is None]
+        for event_id in removed:
+            scheduled_events.pop(event_id, None)
+        if len(removed) < len(changes):
+            # One row per event, a whole batch in one transaction
+            scheduled_events.update_many([(event_id, data) for event_id, data in changes if data is not None])
+else:
+    scheduled_events = load_events()  # { "guildid_eventname": event data }
+    if os.path.exists(EVENTS_JOURNAL_FILE):
+        # Fold the journal into events.json once at startup, so it only ever holds recent changes
+        write_file_atomic(EVENTS_FILE, json.dumps(scheduled_events, indent=4))
+        os.remove(EVENTS_JOURNAL_FILE)
+
+    def persist_events(changes):
+        entries = [{"event_id": event_id, "data": data} for event_id, data in changes]
+        with open(EVENTS_JOURNAL_FILE, "a") as f:
+            f.write(json.dumps(entries[0] if len(entries) == 1 else {"batch": entries}) + "\n")
+
+event_registry = EventRegistry(scheduled_events, persist_events)
+
+# Local copy of every mapped player's in-game data, kept fresh by sync_roster.
+# Not migrated from JSON: the next sync rebuilds it.
+if sqlite_db:
+    roster = SqliteJsonMap(sqlite_db, "roster", "fid", "data")
+    roster_store = roster
+else:
+    roster = read_json_file(ROSTER_FILE)  # { fid: player record, see roster_record() }
+    roster_store = open_store("Roster", ROSTER_FILE, roster)
+
+# Per-guild settings such as the timezone new events are scheduled in
+if sqlite_db:
+    guild_settings = SqliteJsonMap(sqlite_db, "guild_settings", "guild_id", "data")
+    guild_settings_store = guild_settings
+else:
+    guild_settings = read_json_file(GUILD_SETTINGS_FILE)  # { guild_id: {"timezone": "Europe/Berlin"} }
+    guild_settings_store = open_store("Guild settings", GUILD_SETTINGS_FILE, guild_settings)
+
+def guild_timezone(guild_id):
+    return guild_settings.get(str(guild_id), {}).get("timezone", DEFAULT_TIMEZONE)
 
 CHANNELS_PER_PAGE = 10
-# Save events to cache
-def save_events(events):
-    with open(EVENTS_FILE, "w") as f:
-        json.dump(events, f, indent=4)
+ENTRIES_PER_PAGE = 10  # Rows per page in paginated lists
 
 # ---------------------------
 # Discord Bot Setup
@@ -201,7 +759,49 @@ intents = discord.Intents.default()
 intents.members = True           # Enables the bot to see server members
 intents.message_content = True   # Enables access to message content
 
-bot = commands.Bot(command_prefix="!", intents=intents, help_command=None)
+class WhiteoutBot(commands.Bot):
+    shutdown_task = None
+
+    def request_shutdown(self):
+        """SIGTERM (docker stop, systemctl stop): close the bot so pending writes are flushed."""
+        if self.shutdown_task is None:
+            self.shutdown_task = asyncio.create_task(self.close())
+
+    async def setup_hook(self):
+        global game_id_prompt_view
+        # Runs once per process, unlike on_ready which fires again on every reconnect
+        loop = asyncio.get_running_loop()
+        try:
+            loop.add_signal_handler(signal.SIGTERM, self.request_shutdown)
+        except NotImplementedError:
+            # Event loops on Windows have no signal handlers
+            signal.signal(signal.SIGTERM, lambda *_: loop.call_soon_threadsafe(self.request_shutdown))
+        scheduler.start()  # Loads persisted jobs and their next run times
+        logging.info("Scheduler started.")
+        import_events_into_scheduler()
+        await refresh_event_calendar()
+        scheduler.add_job(
+            refresh_event_calendar, IntervalTrigger(hours=1), id="event_calendar_refresh",
+            jobstore="memory", replace_existing=True
+        )
+        schedule_birthdays()  # Register birthday announcements
+        # One persistent view handles the "Add Game ID" button on every prompt, including ones sent before a restart
+        self.add_view(AddGameIDView())
+        # Copy attached to outgoing prompts; stopped so discord.py does not track each sent message
+        game_id_prompt_view = AddGameIDView()
+        game_id_prompt_view.stop()
+
+    async def close(self):
+        # Flush pending writes before the loop goes away
+        await flush_all_stores()
+        logging.info("Pending changes flushed on shutdown.")
+        if http_session:
+            await http_session.close()
+        if sqlite_db:
+            sqlite_db.close()
+        await super().close()
+
+bot = WhiteoutBot(command_prefix="!", intents=intents, help_command=None)
 
 
 tree = bot.tree
@@ -249,7 +849,6 @@ class ChannelSelect(discord.ui.Select):
             f"✅ Birthday notifications will now be sent in **{channel.mention}**!", ephemeral=True
         )
         print(f"🎉 Birthday announcements set to: {channel.name} ({channel.id})")
-        check_birthdays.restart()  # Restart the task with the new channel
 
 # 🔹 View for Dropdown with Pagination Buttons
 class ChannelSelectView(discord.ui.View):
@@ -295,47 +894,110 @@ class PreviousPageButton(discord.ui.Button):
     async def callback(self, interaction: discord.Interaction):
         await interaction.response.edit_message(view=ChannelSelectView(self.bot, self.ctx, self.channels, self.page - 1))
 
-# 🔹 Task to Check and Announce Birthdays
-@tasks.loop(hours=24)
-async def check_birthdays():
-    today = datetime.now().strftime("%B %d")  # ❌ This is a string!
-    logging.info(f"Checking for birthdays on {today}...")
-    # Convert today's date to a datetime object (ignore year)
-    today_date = datetime.now().replace(year=2000, hour=0, minute=0, second=0, microsecond=0)
+# 🔹 View for Paginated Lists, rendering one page of keys at a time
+class PaginatorView(discord.ui.View):
+    def __init__(self, author_id, keys, render_page, page=0):
+        super().__init__()
+        self.author_id = author_id
+        self.keys = keys  # Only the row keys are kept; rows are looked up when their page is shown
+        self.render_page = render_page  # Builds the embed for one page of keys
+        self.page = page
+        self.total_pages = max(1, (len(keys) + ENTRIES_PER_PAGE - 1) // ENTRIES_PER_PAGE)
+
+        # Add navigation buttons if multiple pages exist
+        if self.total_pages > 1:
+            if page > 0:
+                self.add_item(PageButton("◀ Previous", page - 1))
+            if page < self.total_pages - 1:
+                self.add_item(PageButton("▶ Next", page + 1))
 
-    for date_str, names in BIRTHDAYS.items():
-        
-        
-        # Convert stored birthdays to datetime objects
-        date_obj = datetime.strptime(date_str, "%B %d").replace(year=2000, hour=0, minute=0, second=0, microsecond=0)
+    def embed(self):
+        start_index = self.page * ENTRIES_PER_PAGE
+        embed = self.render_page(self.keys[start_index:start_index + ENTRIES_PER_PAGE])
+        if self.total_pages > 1:
+            embed.set_footer(text=f"Page {self.page + 1}/{self.total_pages}")
+        return embed
+
+    async def interaction_check(self, interaction: discord.Interaction):
+        return interaction.user.id == self.author_id  # Only whoever ran the command can turn pages
+
+# 🔹 Button to Go to Another Page of a PaginatorView
+class PageButton(discord.ui.Button):
+    def __init__(self, label, page):
+        super().__init__(label=label, style=discord.ButtonStyle.primary)
+        self.page = page
 
-        # ✅ Correctly compare dates
-        if date_obj == today_date:
-            logging.info(f"🎉 Birthday found for {names}! {birthday_channel_id}")
-            channel = bot.get_channel(birthday_channel_id)
-            if channel:
-                birthday_names = ", ".join(names)
-                await channel.send(f"🎉 **HAPPY BIRTHDAY** 🎉 to {birthday_names}! 🎂🥳")
+    async def callback(self, interaction: discord.Interaction):
+        view = PaginatorView(self.view.author_id, self.view.keys, self.view.render_page, self.page)
+        await interaction.response.edit_message(embed=view.embed(), view=view)
+
+# 🔹 Birthday indexes, parsed once: by (month, day), and sorted by day of year
+def build_birthday_index(birthdays):
+    index = {}
+    for date_str, names in birthdays.items():
+        date_obj = datetime.strptime(f"{date_str} 2000", "%B %d %Y")  # Leap year, so February 29 parses
+        index.setdefault((date_obj.month, date_obj.day), []).extend(names)
+    return index
+
+def birthday_day_of_year(month, day):
+    """Day of year in a leap year, so every date keeps the same number whatever the year."""
+    return datetime(2000, month, day).timetuple().tm_yday
+
+def rebuild_birthday_indexes():
+    """Rebuilds both indexes; call again whenever BIRTHDAYS changes."""
+    global birthdays_by_day, birthday_calendar, birthday_days
+    birthdays_by_day = build_birthday_index(BIRTHDAYS)
+    birthday_calendar = sorted(
+        (birthday_day_of_year(month, day), month, day, names)
+        for (month, day), names in birthdays_by_day.items()
+    )
+    birthday_days = [entry[0] for entry in birthday_calendar]  # Bisect keys
+
+rebuild_birthday_indexes()
+
+def upcoming_birthdays(limit, today=None):
+    """The next `limit` birthday dates from today (included), wrapping into next year."""
+    today = today or datetime.now()
+    start = bisect.bisect_left(birthday_days, birthday_day_of_year(today.month, today.day))
+    count = min(limit, len(birthday_calendar))
+    return [birthday_calendar[(start + offset) % len(birthday_calendar)] for offset in range(count)]
+
+# 🔹 Job to Announce Birthdays, fired by the scheduler on each birthday
+async def announce_birthdays(month, day):
+    names = birthdays_by_day.get((month, day))
+    if not names:
+        return  # Removed since the job was scheduled
+    logging.info(f"🎉 Birthday found for {names}! {birthday_channel_id}")
+    channel = bot.get_channel(birthday_channel_id) if birthday_channel_id else None
+    if channel:
+        birthday_names = ", ".join(names)
+        await channel.send(f"🎉 **HAPPY BIRTHDAY** 🎉 to {birthday_names}! 🎂🥳")
+
+def schedule_birthdays():
+    """Registers one yearly cron job per birthday date at BIRTHDAY_ANNOUNCE_TIME."""
+    hour, minute = map(int, BIRTHDAY_ANNOUNCE_TIME.split(":"))
+    for month, day in birthdays_by_day:
+        scheduler.add_job(
+            announce_birthdays,
+            CronTrigger(month=month, day=day, hour=hour, minute=minute),
+            args=[month, day],
+            id=f"birthday_{month}_{day}",
+            jobstore="memory",  # Rebuilt from BIRTHDAYS on every start, so not persisted
+            replace_existing=True,
+            misfire_grace_time=3600,  # Still announce if the bot was briefly down at that time
+            coalesce=True
+        )
+    logging.info(f"🎂 Scheduled {len(birthdays_by_day)} birthday announcements at {BIRTHDAY_ANNOUNCE_TIME}.")
 
 # 🔹 Command to Manually Check Upcoming Birthdays
 @bot.tree.command(name="birthdays", description="Check upcoming birthdays")
 async def birthdays(interaction: discord.Interaction):
-    today = datetime.now().replace(year=2000)  # Year is ignored for comparison
-    upcoming = []
-
-    # Convert all birthday keys to datetime objects and filter correctly
-    for date_str, names in BIRTHDAYS.items():
-        date_obj = datetime.strptime(date_str, "%B %d").replace(year=2000)
-        if date_obj >= today:
-            upcoming.append((date_obj, date_str, names))
-
-    # Sort by date
-    upcoming.sort()
+    upcoming = upcoming_birthdays(10)  # Limit to 10 upcoming birthdays
 
     # Format output
     embed = discord.Embed(title="🎂 Upcoming Birthdays", color=discord.Color.blue())
-    for _, date_str, names in upcoming[:10]:  # Limit to 10 upcoming birthdays
-        embed.add_field(name=f"📅 {date_str}", value=", ".join(names), inline=False)
+    for _, month, day, names in upcoming:
+        embed.add_field(name=f"📅 {datetime(2000, month, day).strftime('%B')} {day}", value=", ".join(names), inline=False)
 
     if not upcoming:
         embed.description = "No upcoming birthdays."
@@ -345,28 +1007,291 @@ async def birthdays(interaction: discord.Interaction):
 # ---------------------------
 # Scheduler Setup
 # ---------------------------
-scheduler = AsyncIOScheduler()
+# Event jobs and their next run times live in SCHEDULER_DB_FILE, so they survive restarts on their own
+scheduler_engine = sqlalchemy.create_engine(f"sqlite:///{SCHEDULER_DB_FILE}")
+
+@sqlalchemy.event.listens_for(scheduler_engine, "connect")
+def configure_scheduler_db(connection, _):
+    # Same settings as the bot's own SQLite storage: every job change is a commit,
+    # and without them each one waits on a full disk sync
+    connection.execute("PRAGMA journal_mode=WAL")
+    connection.execute("PRAGMA synchronous=NORMAL")
+
+scheduler = AsyncIOScheduler(
+    jobstores={
+        "default": SQLAlchemyJobStore(engine=scheduler_engine),
+        "memory": MemoryJobStore(),
+    },
+    job_defaults={
+        "misfire_grace_time": SCHEDULER_MISFIRE_GRACE_SECONDS,
+        "coalesce": SCHEDULER_COALESCE,
+    }
+)
+
+# -----------------------------------
+# Shared HTTP Session
+# -----------------------------------
+http_session = None
+
+async def get_http_session():
+    """Returns the bot-wide aiohttp session, creating its keep-alive pool on first use."""
+    global http_session
+    if http_session is None or http_session.closed:
+        http_session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=HTTP_POOL_SIZE, keepalive_timeout=30),
+            timeout=aiohttp.ClientTimeout(total=HTTP_TIMEOUT_SECONDS)
+        )
+    return http_session
+
+# -----------------------------------
+# Token Bucket Rate Limiter
+# -----------------------------------
+class TokenBucket:
+    """Async token bucket: refills `rate` tokens per second up to `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.lock = None  # Created lazily so it binds to the running event loop
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    async def acquire(self):
+        if self.lock is None:
+            self.lock = asyncio.Lock()
+        async with self.lock:
+            self._refill()
+            while self.tokens < 1:
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+                self._refill()
+            self.tokens -= 1
+
+    def penalize(self, seconds):
+        """Drains the bucket so nobody sends for `seconds` (used when the API answers 429)."""
+        self._refill()
+        self.tokens = min(self.tokens, 0) - seconds * self.rate
+
+# One bucket for every call to the centurygame API, shared by all commands
+wos_api_bucket = TokenBucket(WOS_API_RATE_PER_SECOND, WOS_API_BURST)
 
 # -----------------------------------
 # Function to fetch game profile
 # -----------------------------------
-def fetch_game_profile(game_id):
-    secret = SECRET_KEY
-    timestamp = str(int(time.time() * 1000))
+async def fetch_game_profile(game_id):
+    """Fetches a player's in-game profile; prefer player_info_cache.get() over calling this directly."""
+    try:
+        return await post_wos_api(PLAYER_INFO_URL, {"fid": game_id})
+    except json.JSONDecodeError:
+        return None
 
-    form = f"fid={game_id}&time={timestamp}"
-    sign = hashlib.md5((form + secret).encode()).hexdigest()
-    form = f"sign={sign}&" + form
+# -----------------------------------
+# Player Info Cache
+# -----------------------------------
+class PlayerInfoCache:
+    """Player info keyed by fid, with a TTL, LRU eviction by size and single-flight fetches.
 
-    url = "https://wos-giftcode-api.centurygame.com/api/player"
-    headers = {"Content-Type": "application/x-www-form-urlencoded"}
-    response = requests.post(url, headers=headers, data=form)
+    Entries older than `ttl` are still served for another `stale` seconds while
+    a background refresh runs. Only successful answers (code 0) are cached.
+    """
 
-    try:
-        return response.json()
-    except requests.exceptions.JSONDecodeError:
+    def __init__(self, fetch, ttl, stale, max_bytes):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.stale = stale
+        self.max_bytes = max_bytes
+        self.entries = OrderedDict()  # { fid: (fetched_at, size, data) }, least recently used first
+        self.size = 0
+        self.inflight = {}            # { fid: task } for fetches currently running
+        self.hits = self.stale_hits = self.misses = 0
+        self.fetches = 0
+        self.fetch_seconds = 0.0
+
+    def lookup(self, fid):
+        """The cached entry for `fid` if it can still be served, else None."""
+        entry = self.entries.get(str(fid))
+        if entry and time.monotonic() - entry[0] < self.ttl + self.stale:
+            return entry
         return None
-  
+
+    def __contains__(self, fid):
+        return self.lookup(fid) is not None
+
+    async def get(self, fid):
+        fid = str(fid)
+        entry = self.lookup(fid)
+        if entry:
+            self.entries.move_to_end(fid)
+            if time.monotonic() - entry[0] < self.ttl:
+                self.hits += 1
+            else:
+                self.stale_hits += 1
+                self.refresh(fid)  # Serve the stale copy now, refresh in the background
+            return entry[2]
+
+        self.misses += 1
+        # Shield the shared fetch so one caller giving up does not cancel it for the others
+        return await asyncio.shield(self.refresh(fid))
+
+    def refresh(self, fid):
+        """Starts fetching `fid` unless a fetch is already running; returns that task."""
+        task = self.inflight.get(fid)
+        if task is None:
+            task = asyncio.create_task(self.load(fid))
+            self.inflight[fid] = task
+        return task
+
+    async def load(self, fid):
+        started = time.perf_counter()
+        try:
+            data = await self.fetch(fid)
+        except Exception as e:
+            logging.error(f"❌ Failed to fetch player {fid}: {e}")
+            data = None
+        finally:
+            self.inflight.pop(fid, None)
+            self.fetches += 1
+            self.fetch_seconds += time.perf_counter() - started
+
+        if data and data.get("code") == 0:
+            self.store(fid, data)
+        return data
+
+    def store(self, fid, data):
+        old = self.entries.pop(fid, None)
+        if old:
+            self.size -= old[1]
+        size = len(json.dumps(data))
+        self.entries[fid] = (time.monotonic(), size, data)
+        self.size += size
+        while self.size > self.max_bytes and len(self.entries) > 1:
+            _, (_, evicted_size, _) = self.entries.popitem(last=False)
+            self.size -= evicted_size
+
+    def stats(self):
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self.entries),
+            "bytes": self.size,
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_ratio": round((self.hits + self.stale_hits) / lookups, 3) if lookups else None,
+            "fetches": self.fetches,
+            "avg_fetch_ms": round(self.fetch_seconds / self.fetches * 1000, 1) if self.fetches else None,
+        }
+
+player_info_cache = PlayerInfoCache(fetch_game_profile, PLAYER_CACHE_TTL_SECONDS, PLAYER_CACHE_STALE_SECONDS, PLAYER_CACHE_MAX_BYTES)
+
+# -----------------------------------
+# Alliance Roster Sync
+# -----------------------------------
+roster_sync_bucket = TokenBucket(ROSTER_SYNC_RATE_PER_SECOND, 1)  # On top of wos_api_bucket
+roster_sync_stats = {}
+
+class RosterIndex:
+    """Roster players kept sorted by stove level and by last upgrade, with a count per level."""
+
+    def __init__(self):
+        self.by_level = []      # Sorted (-stove_lv, nickname, fid)
+        self.by_upgrade = []    # Sorted (-upgraded_at, fid) for players with a recorded upgrade
+        self.keys = {}          # { fid: (level key, upgrade key or None) }
+        self.level_counts = {}  # { stove_lv: players }
+
+    def update(self, fid, record):
+        self.remove(fid)
+        level_key = (-record["stove_lv"], record["nickname"].lower(), fid)
+        bisect.insort(self.by_level, level_key)
+        upgrade_key = None
+        if len(record["history"]) > 1:
+            upgrade_key = (-record["history"][-1][0], fid)
+            bisect.insort(self.by_upgrade, upgrade_key)
+        self.keys[fid] = (level_key, upgrade_key)
+        self.level_counts[record["stove_lv"]] = self.level_counts.get(record["stove_lv"], 0) + 1
+
+    def remove(self, fid):
+        keys = self.keys.pop(fid, None)
+        if keys is None:
+            return
+        level_key, upgrade_key = keys
+        del self.by_level[bisect.bisect_left(self.by_level, level_key)]
+        if upgrade_key:
+            del self.by_upgrade[bisect.bisect_left(self.by_upgrade, upgrade_key)]
+        stove_lv = -level_key[0]
+        self.level_counts[stove_lv] -= 1
+        if not self.level_counts[stove_lv]:
+            del self.level_counts[stove_lv]
+
+    def at_least(self, stove_lv):
+        """Players at `stove_lv` or above, highest first."""
+        return self.by_level[:bisect.bisect_left(self.by_level, (-stove_lv + 1,))]
+
+roster_index = RosterIndex()
+for fid, record in roster.items():
+    roster_index.update(fid, record)
+
+def roster_record(player, previous=None):
+    """Compact roster entry for a player info answer, extending the stove level history."""
+    history = list(previous["history"]) if previous else []
+    if not history or history[-1][1] != player["stove_lv"]:
+        history.append([int(time.time()), player["stove_lv"]])  # [when it was first seen, stove_lv]
+    return {
+        "fid": player["fid"],
+        "nickname": player["nickname"],
+        "stove_lv": player["stove_lv"],
+        "avatar_image": player["avatar_image"],
+        "synced_at": int(time.time()),
+        "history": history,
+    }
+
+def update_roster(fid, data):
+    """Stores a successful player info answer in the roster."""
+    fid = str(fid)
+    roster[fid] = record = roster_record(data["data"], roster.get(fid))
+    roster_store.mark_dirty()
+    roster_index.update(fid, record)
+
+async def sync_player(fid, semaphore):
+    async with semaphore:
+        await roster_sync_bucket.acquire()
+        data = await player_info_cache.refresh(str(fid))  # Also refreshes the cache for commands
+    if not data or data.get("code") != 0:
+        return False
+    update_roster(fid, data)
+    return True
+
+@tasks.loop(minutes=ROSTER_SYNC_INTERVAL_MINUTES)
+async def sync_roster():
+    """Refreshes every mapped player into the roster and drops players no longer mapped."""
+    fids = {str(game_id) for game_id in user_id_map.values()}
+    semaphore = asyncio.Semaphore(ROSTER_SYNC_CONCURRENCY)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(sync_player(fid, semaphore) for fid in fids))
+
+    for fid in [fid for fid in roster if fid not in fids]:
+        del roster[fid]
+        roster_store.mark_dirty()
+        roster_index.remove(fid)
+
+    seconds = time.perf_counter() - started
+    roster_sync_stats.update(
+        synced_at=datetime.now().isoformat(timespec="seconds"),
+        players=len(fids),
+        updated=sum(results),
+        failed=len(results) - sum(results),
+        seconds=round(seconds, 1),
+        requests_per_second=round(len(fids) / seconds, 2) if seconds else None,
+    )
+    logging.info(f"🧊 Roster synced: {roster_sync_stats}")
+
+@sync_roster.before_loop
+async def before_sync_roster():
+    await bot.wait_until_ready()
+
 def generate_signature(data):
     """Generates MD5 hash signature for API authentication."""
     sorted_keys = sorted(data.keys())
@@ -375,39 +1300,69 @@ def generate_signature(data):
     )
     return hashlib.md5(f"{encoded_data}{SECRET_KEY}".encode()).hexdigest()
 
-def test_player_info(player_id):
-    """Fetches player info from the API."""
-    data = {
-        "fid": player_id,
-        "time": str(int(time.time()))
-    }
-    data["sign"] = generate_signature(data)
+async def post_wos_api(url, fields):
+    """Signs and POSTs `fields` to the centurygame API, retrying transient errors with backoff.
 
-    response = requests.post(PLAYER_INFO_URL, headers={"Content-Type": "application/x-www-form-urlencoded"}, data=data)
-    
+    Returns the decoded JSON body, or None once all retries are used up.
+    Raises json.JSONDecodeError if the API answers with something that is not JSON.
+    """
+    session = await get_http_session()
+
+    for attempt in range(WOS_API_MAX_RETRIES + 1):
+        # Sign on every attempt: the API rejects stale timestamps
+        data = dict(fields, time=str(int(time.time())))
+        data["sign"] = generate_signature(data)
+
+        await wos_api_bucket.acquire()
+        delay = WOS_API_BACKOFF_SECONDS * (2 ** attempt) + random.uniform(0, WOS_API_BACKOFF_SECONDS)
+        try:
+            async with session.post(url, data=data) as response:
+                if response.status == 429:
+                    try:
+                        retry_after = float(response.headers.get("Retry-After", delay))
+                    except ValueError:
+                        retry_after = delay
+                    wos_api_bucket.penalize(retry_after)
+                    logging.warning(f"⚠ Rate limited by {url}, backing off for {retry_after:.1f}s.")
+                    continue
+                if response.status >= 500:
+                    logging.warning(f"⚠ {url} answered {response.status} (attempt {attempt + 1}).")
+                else:
+                    text = await response.text()
+                    try:
+                        result = json.loads(text)
+                    except json.JSONDecodeError as e:
+                        logging.error(f"Failed to decode JSON response: {e}. Response text: {text}")
+                        raise
+                    if result.get("msg") != "TIMEOUT RETRY.":
+                        return result
+                    logging.warning(f"⚠ {url} asked to retry (attempt {attempt + 1}).")
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logging.warning(f"⚠ Request to {url} failed (attempt {attempt + 1}): {e}")
+
+        if attempt < WOS_API_MAX_RETRIES:
+            await asyncio.sleep(delay)
+
+    logging.error(f"❌ Giving up on {url} after {WOS_API_MAX_RETRIES + 1} attempts.")
+    return None
+
+async def login_player(player_id):
+    """Fetches player info from the API; the gift code endpoint expects this call first."""
     try:
-        result = response.json()
+        return await post_wos_api(PLAYER_INFO_URL, {"fid": player_id})
     except json.JSONDecodeError:
-        logging.error("Failed to decode JSON response.")
-
-def redeem_gift_code(gift_code, player_id):
-    """Fetches available gift codes for the player."""
-    print("\n🔹 Testing Gift Code API...")
-    data = {
-        "fid": player_id,
-        "time": str(int(time.time())),
-        "cdk": gift_code
-    }
-    data["sign"] = generate_signature(data)
+        return None
 
-    response = requests.post(GIFT_CODE_URL, headers={"Content-Type": "application/x-www-form-urlencoded"}, data=data)
-    
+async def redeem_gift_code(gift_code, player_id):
+    """Redeems a gift code for a single player and returns the outcome."""
     try:
-        result = response.json()
-        logging.info(f"Response: {result}")
-    except json.JSONDecodeError as e:
-        logging.error(f"Failed to decode JSON response: {e}. Response text: {response.text}")
+        result = await post_wos_api(GIFT_CODE_URL, {"fid": player_id, "cdk": gift_code})
+    except json.JSONDecodeError:
         return "JSON ERROR"
+    if result is None:
+        return "ERROR"
+    logging.info(f"Response for {player_id}: {result}")
+
     if result.get("msg") == "SUCCESS":
         return "SUCCESS"
     elif result.get("msg") == "RECEIVED." and result.get("err_code") == 40008:
@@ -418,96 +1373,643 @@ def redeem_gift_code(gift_code, player_id):
         return "ALREADY_RECEIVED"
     else:
         return "ERROR"
+
+async def redeem_gift_code_for_players(gift_code, player_ids):
+    """Redeems a gift code for many players at once, keeping GIFT_CODE_CONCURRENCY in flight.
+
+    Outcomes are recorded in the redemption ledger, and once the code turns
+    out not to exist the remaining players are not contacted anymore.
+    Returns a dict mapping each player ID to its outcome.
+    """
+    semaphore = asyncio.Semaphore(GIFT_CODE_CONCURRENCY)
+
+    async def redeem_one(player_id):
+        async with semaphore:
+            if gift_code in dead_gift_codes:
+                return player_id, "CDK_NOT_FOUND"
+            await login_player(player_id)
+            result = await redeem_gift_code(gift_code, player_id)
+            record_redemption(gift_code, player_id, result)
+            return player_id, result
+
+    return dict(await asyncio.gather(*(redeem_one(player_id) for player_id in player_ids)))
+
 # -----------------------------------
-# Restore scheduled events from cache
+# Scheduler Jobs for Events
 # -----------------------------------
-def restore_events():
-    events = load_events()
-    restored_count = 0  # Track how many events are restored
+INTERVAL_UNITS = {"minutes", "hours", "days"}
+WEEKDAYS = ["mon", "tue", "wed", "thu", "fri", "sat", "sun"]
+
+def parse_hhmm(text):
+    hour, minute = map(int, text.split(":"))
+    if not (0 <= hour < 24 and 0 <= minute < 60):
+        raise ValueError(f"{text!r} is not a valid HH:MM time")
+    return hour, minute
+
+def event_timezone(data):
+    # Events from before per-event timezones keep running in the host's local time, as they always did
+    return ZoneInfo(data["timezone"]) if data.get("timezone") else tzlocal.get_localzone()
+
+def event_trigger(data):
+    """Builds the APScheduler trigger for an event as stored in event_registry."""
+    if data["mode"] == "weekly":
+        return CronTrigger(
+            day_of_week=data["day_of_week"], hour=int(data["hour"]), minute=int(data["minute"]),
+            timezone=event_timezone(data)
+        )
+    if data["mode"] == "interval":
+        if data["interval_unit"] not in INTERVAL_UNITS:
+            raise ValueError(f"unknown interval unit {data['interval_unit']!r}")
+        start_datetime = datetime.strptime(f"{data['start_date']} {data['start_time']}", "%Y-%m-%d %H:%M")
+        if data["interval_unit"] == "days":
+            # Keeps the same wall-clock time across DST changes
+            return CalendarIntervalTrigger(
+                days=data["interval_value"], hour=start_datetime.hour, minute=start_datetime.minute,
+                start_date=start_datetime.date(), timezone=event_timezone(data)
+            )
+        # Runs stay aligned to the original start without any catch-up arithmetic
+        return IntervalTrigger(
+            **{data["interval_unit"]: data["interval_value"]}, start_date=start_datetime, timezone=event_timezone(data)
+        )
+    if data["mode"] == "reset":
+        # A fixed offset after the daily game server reset, on every day or on one weekday
+        reset_hour, reset_minute = parse_hhmm(GAME_RESET_TIME)
+        total_minutes = reset_hour * 60 + reset_minute + int(data["offset_hour"]) * 60 + int(data["offset_minute"])
+        day_shift, minutes = divmod(total_minutes, 24 * 60)
+        day_of_week = data.get("day_of_week")
+        if day_of_week:
+            day_of_week = WEEKDAYS[(WEEKDAYS.index(day_of_week[:3]) + day_shift) % 7]
+        return CronTrigger(
+            day_of_week=day_of_week, hour=minutes // 60, minute=minutes % 60, timezone=ZoneInfo(GAME_RESET_TIMEZONE)
+        )
+    raise ValueError(f"unknown mode {data['mode']!r}")
+
+def add_event_job(event_id, data):
+    # One job per event whatever the number of channels; fire_event reads the targets when it runs
+    scheduler.add_job(fire_event, event_trigger(data), args=[event_id], id=event_id, replace_existing=True)
+
+def put_event(event_id, data):
+    """Schedules (or reschedules) an event and records it; invalid data raises before anything is stored."""
+    add_event_job(event_id, data)
+    event_registry.put(event_id, data)
+    event_calendar.refresh_event(event_id, data)
+
+def put_events(items):
+    """Schedules and records a batch of (event_id, data) with a single persistence write.
+
+    If a job cannot be scheduled, the jobs already changed are restored and nothing is stored.
+    """
+    previous = {event_id: event_registry.get(event_id) for event_id, _ in items}
+    scheduled = []
+    try:
+        for event_id, data in items:
+            add_event_job(event_id, data)
+            scheduled.append(event_id)
+    except Exception:
+        for event_id in scheduled:
+            if previous[event_id]:
+                add_event_job(event_id, previous[event_id])
+            else:
+                scheduler.remove_job(event_id)
+        raise
+    event_registry.put_many(items)
+    event_calendar.refresh_events(items)
+
+def delete_event(event_id):
+    """Unschedules and forgets an event."""
+    try:
+        scheduler.remove_job(event_id)
+    except JobLookupError:
+        pass  # Already gone from the scheduler
+    event_calendar.drop_event(event_id)
+    return event_registry.remove(event_id)
+
+def describe_event_schedule(data):
+    if data["mode"] == "weekly":
+        return "Weekly", f"Every {data['day_of_week']} at {int(data['hour']):02d}:{int(data['minute']):02d} ({event_timezone(data)})"
+    if data["mode"] == "reset":
+        offset = f"{int(data['offset_hour']):02d}:{int(data['offset_minute']):02d}"
+        days = f"Every {data['day_of_week']}" if data.get("day_of_week") else "Every day"
+        return "Reset", f"{days}, {offset} after the game reset"
+    return "Interval", f"Every {data['interval_value']} {data['interval_unit']} ({event_timezone(data)})"
+
+# -----------------------------------
+# Event Calendar
+# -----------------------------------
+class EventCalendar:
+    """Upcoming occurrences of every event, precomputed so lookups never evaluate triggers.
+
+    Each event gets its occurrences over the next `days` days plus the first one after them
+    (at most `per_event`), so even an event rarer than the window always has a next run.
+    They are recomputed when the event changes and by an hourly refresh.
+    """
 
-    for event_id, data in events.items():
-        mode = data["mode"]
-        channel_id = data["channel_id"]
-        message = data["message"]
+    def __init__(self, days, per_event):
+        self.days = days
+        self.per_event = per_event
+        self.runs = {}      # { event_id: [run time, ...] } in order
+        self.by_guild = {}  # { guild_id: [(run time, event_id), ...] } in order
+
+    def occurrences(self, data, now):
+        trigger = event_trigger(data)
+        until = now + timedelta(days=self.days)
+        runs = []
+        previous, after = None, now
+        if isinstance(trigger, CalendarIntervalTrigger):
+            # Its first run is always start_date whatever `now` is, so walk from the last period before today
+            periods = (now.astimezone(trigger.timezone).date() - trigger.start_date).days // trigger.days
+            if periods > 0:
+                previous = datetime.combine(trigger.start_date + timedelta(days=(periods - 1) * trigger.days), datetime.min.time())
+        while len(runs) < self.per_event:
+            run_time = trigger.get_next_fire_time(previous, after)
+            if run_time is None:
+                break
+            previous, after = run_time, run_time + timedelta(seconds=1)
+            if run_time >= now:
+                runs.append(run_time)  # Past runs are skipped and do not count toward per_event
+                if run_time > until:
+                    break  # Keep one run past the window, however far away
+        return runs
+
+    def _compute(self, event_id, data, now):
+        try:
+            return self.occurrences(data, now)
+        except (KeyError, ValueError, ZoneInfoNotFoundError) as e:
+            logging.error(f"❌ Cannot compute occurrences of {event_id}: {e}")
+            return []
+
+    def _merged(self, guild_id):
+        return sorted(
+            (run_time, event_id)
+            for event_id, _ in event_registry.in_guild(guild_id)
+            for run_time in self.runs.get(event_id, ())
+        )
+
+    def _merge_guild(self, guild_id):
+        merged = self._merged(guild_id)
+        if merged:
+            self.by_guild[guild_id] = merged
+        else:
+            self.by_guild.pop(guild_id, None)
+
+    def rebuild(self, events):
+        now = datetime.now(ZoneInfo("UTC"))
+        # Built aside and swapped in whole, so lookups never see a half-built calendar
+        self.runs = {event_id: self._compute(event_id, data, now) for event_id, data in events}
+        by_guild = {guild_id: self._merged(guild_id) for guild_id in event_registry.by_guild}
+        self.by_guild = {guild_id: merged for guild_id, merged in by_guild.items() if merged}
+
+    def refresh_event(self, event_id, data):
+        self.refresh_events([(event_id, data)])
+
+    def refresh_events(self, items):
+        now = datetime.now(ZoneInfo("UTC"))
+        for event_id, data in items:
+            self.runs[event_id] = self._compute(event_id, data, now)
+        for guild_id in {event_id.split("_", 1)[0] for event_id, _ in items}:
+            self._merge_guild(guild_id)  # Once per guild, however many of its events changed
+
+    def drop_event(self, event_id):
+        self.runs.pop(event_id, None)
+        guild_id = event_id.split("_", 1)[0]
+        if guild_id in self.by_guild:
+            self.by_guild[guild_id] = [entry for entry in self.by_guild[guild_id] if entry[1] != event_id]
+
+    def next_run(self, event_id):
+        """The next occurrence of an event, or None if it will not run again."""
+        runs = self.runs.get(event_id, [])
+        index = bisect.bisect_right(runs, datetime.now(ZoneInfo("UTC")))
+        if index >= len(runs) and event_id in event_registry:
+            # The event outran its precomputed runs before the hourly refresh
+            self.refresh_event(event_id, event_registry.get(event_id))
+            runs = self.runs[event_id]
+            index = bisect.bisect_right(runs, datetime.now(ZoneInfo("UTC")))
+        return runs[index] if index < len(runs) else None
+
+    def upcoming(self, guild_id, days):
+        """(run time, event_id) pairs for the guild within the next `days` days."""
+        entries = self.by_guild.get(str(guild_id), [])
+        now = datetime.now(ZoneInfo("UTC"))
+        start = bisect.bisect_right(entries, (now, ""))
+        end = bisect.bisect_right(entries, (now + timedelta(days=days), "\uffff"))
+        return entries[start:end]
+
+event_calendar = EventCalendar(EVENT_CALENDAR_DAYS, EVENT_CALENDAR_PER_EVENT)
+
+async def refresh_event_calendar():
+    # A coroutine so the scheduler runs it on the event loop, never alongside registry changes in a thread
+    event_calendar.rebuild(list(event_registry.items()))
+
+def import_events_into_scheduler():
+    """One-shot import of events scheduled before the persistent job store existed."""
+    db = sqlite3.connect(SCHEDULER_DB_FILE)
+    try:
+        db.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+        if db.execute("SELECT 1 FROM meta WHERE key = 'events_imported'").fetchone():
+            return
 
-        if mode == "weekly":
+        imported_count = 0
+        for event_id, data in event_registry.items():
             try:
-                # Ensure correct data format
-                day_of_week = data["day_of_week"]
-                hour = int(data["hour"])
-                minute = int(data["minute"])
-
-                trigger = CronTrigger(day_of_week=day_of_week, hour=hour, minute=minute)
-
-                scheduler.add_job(
-                    notify_event,
-                    trigger,
-                    args=[channel_id, message],
-                    id=event_id,
-                    replace_existing=True
-                )
-                restored_count += 1
-                logging.info(f"✅ Restored weekly event '{event_id}' for {day_of_week} at {hour}:{minute}.")
-            
+                add_event_job(event_id, data)
+                imported_count += 1
             except KeyError as e:
-                logging.error(f"❌ Skipping weekly event {event_id}: Missing key {e}")
+                logging.error(f"❌ Skipping event {event_id}: Missing key {e}")
             except ValueError as e:
-                logging.error(f"❌ Skipping weekly event {event_id}: Invalid data format - {e}")
+                logging.error(f"❌ Skipping event {event_id}: Invalid data format - {e}")
 
-        elif mode == "interval":
-            try:
-                # Combine start_date and start_time into a full datetime string
-                start_datetime_str = f"{data['start_date']} {data['start_time']}"
-                last_start = datetime.strptime(start_datetime_str, "%Y-%m-%d %H:%M")  # Convert to datetime
-                now = datetime.utcnow()
-
-                # Calculate the correct time until the next execution
-                time_passed = (now - last_start).total_seconds()
-                interval_seconds = (
-                    data["interval_value"] * 60 if data["interval_unit"] == "minutes"
-                    else data["interval_value"] * 3600 if data["interval_unit"] == "hours"
-                    else data["interval_value"] * 86400
-                )
+        db.execute("INSERT INTO meta (key, value) VALUES ('events_imported', ?)", (datetime.now().isoformat(),))
+        db.commit()
+        logging.info(f"📦 Imported {imported_count} scheduled events into {SCHEDULER_DB_FILE}.")
+    finally:
+        db.close()
 
-                # Align the next run correctly
-                next_run_seconds = interval_seconds - (time_passed % interval_seconds)
-                next_run_time = now + timedelta(seconds=next_run_seconds)
 
-                trigger = IntervalTrigger(seconds=interval_seconds, start_date=next_run_time)
 
-                scheduler.add_job(
-                    notify_event,
-                    trigger,
-                    args=[channel_id, message],
-                    id=event_id,
-                    replace_existing=True
-                )
-                restored_count += 1
-                logging.info(f"✅ Restored interval event '{event_id}' to start at {next_run_time} every {data['interval_value']} {data['interval_unit']}.")
+# ---------------------------
+# Like Graph
+# ---------------------------
+class LikeGraph:
+    """In-memory like graph with set-based adjacency in both directions.
 
-            except KeyError as e:
-                logging.error(f"❌ Skipping interval event {event_id}: Missing key {e}")
-            except ValueError as e:
-                logging.error(f"❌ Skipping interval event {event_id}: Invalid date/time format - {e}")
+    `liked` maps liker -> likees and `likers` maps likee -> likers, so every
+    query below costs O(degree) instead of a scan over all likes.
+    """
+
+    def __init__(self):
+        self.liked = {}   # { liker_id: {likee_id, ...} }
+        self.likers = {}  # { likee_id: {liker_id, ...} }
+
+    def add(self, liker_id, likee_id):
+        liked = self.liked.setdefault(liker_id, set())
+        if likee_id in liked:
+            return False
+        liked.add(likee_id)
+        self.likers.setdefault(likee_id, set()).add(liker_id)
+        return True
+
+    def remove(self, liker_id, likee_id):
+        liked = self.liked.get(liker_id)
+        if not liked or likee_id not in liked:
+            return False
+        liked.discard(likee_id)
+        self.likers[likee_id].discard(liker_id)
+        return True
+
+    def has_liked(self, liker_id, likee_id):
+        return likee_id in self.liked.get(liker_id, ())
+
+    def likers_of(self, member_id):
+        return self.likers.get(member_id, set())
 
-    logging.info(f"🔄 Restored {restored_count} scheduled events.")
+    def liked_by(self, member_id):
+        return self.liked.get(member_id, set())
 
+like_graph = LikeGraph()  # Every like query is answered here, whatever the storage backend
+if sqlite_db:
+    for liker_id, likee_id in sqlite_db.execute("SELECT liker_id, likee_id FROM likes"):
+        like_graph.add(liker_id, likee_id)
+else:
+    for likee_id, likers in likes_cache.items():
+        for liker_id in likers:
+            like_graph.add(liker_id, likee_id)
+
+# ---------------------------
+# Top Likes Leaderboard
+# ---------------------------
+class LikeLeaderboard:
+    """Like counts kept ranked as likes come and go, one step at a time.
 
+    Members are bucketed by like count (`buckets`, in the order they reached it),
+    `levels` lists the non-empty counts in ascending order, and a Fenwick tree over
+    counts tells how many members sit above a given count. Top-K costs O(K) and a
+    member's rank O(log n); no call ever sorts all members.
+    """
+
+    def __init__(self):
+        self.counts = {}   # { member_id: like count }
+        self.buckets = {}  # { like count: {member_id: None} }
+        self.levels = []   # Non-empty like counts, ascending
+        self.tree = [0]    # Fenwick tree of members per like count, 1-indexed
+        self.ranked = 0    # Members with at least one like
+
+    def _prefix(self, count):
+        """Members with between 1 and `count` likes."""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+
+    def _update_tree(self, count, delta):
+        # Grow the tree on demand; a new node covers (i - lowbit(i), i], all of which already exists
+        while len(self.tree) <= count:
+            index = len(self.tree)
+            self.tree.append(self._prefix(index - 1) - self._prefix(index - (index & -index)))
+        while count < len(self.tree):
+            self.tree[count] += delta
+            count += count & -count
+
+    def _move(self, member_id, old, new):
+        if old > 0:
+            bucket = self.buckets[old]
+            del bucket[member_id]
+            if not bucket:
+                del self.buckets[old]
+                del self.levels[bisect.bisect_left(self.levels, old)]
+            self._update_tree(old, -1)
+            self.ranked -= 1
+        if new > 0:
+            if new not in self.buckets:
+                self.buckets[new] = {}
+                bisect.insort(self.levels, new)
+            self.buckets[new][member_id] = None
+            self._update_tree(new, 1)
+            self.ranked += 1
+            self.counts[member_id] = new
+        else:
+            self.counts.pop(member_id, None)
+
+    def set_count(self, member_id, count):
+        self._move(member_id, self.counts.get(member_id, 0), count)
+
+    def increment(self, member_id):
+        self.set_count(member_id, self.counts.get(member_id, 0) + 1)
+
+    def decrement(self, member_id):
+        self.set_count(member_id, max(self.counts.get(member_id, 0) - 1, 0))
+
+    def top(self, limit):
+        """The `limit` most liked members as (member_id, like count), most liked first."""
+        result = []
+        for count in reversed(self.levels):
+            for member_id in self.buckets[count]:
+                if len(result) >= limit:
+                    return result
+                result.append((member_id, count))
+        return result
+
+    def rank(self, member_id):
+        """1-based rank (ties share a rank), or None if the member has no likes."""
+        count = self.counts.get(member_id)
+        if not count:
+            return None
+        return self.ranked - self._prefix(count) + 1
+
+like_leaderboard = LikeLeaderboard()
+for likee_id, likers in like_graph.likers.items():
+    if likers:
+        like_leaderboard.set_count(likee_id, len(likers))
 
 # ---------------------------
-# Likes Management Functions
+# Mutual Matches
+# ---------------------------
+# Materialized once here, then only touched when a like closes or breaks a pair.
+mutual_matches = {}  # { member_id: {partner_id, ...} }
+
+def link_match(member_id, partner_id):
+    mutual_matches.setdefault(member_id, set()).add(partner_id)
+    mutual_matches.setdefault(partner_id, set()).add(member_id)
+
+def unlink_match(member_id, partner_id):
+    mutual_matches.get(member_id, set()).discard(partner_id)
+    mutual_matches.get(partner_id, set()).discard(member_id)
+
+for liker_id, liked in like_graph.liked.items():
+    for likee_id in liked:
+        if like_graph.has_liked(likee_id, liker_id):
+            link_match(liker_id, likee_id)
+
+# ---------------------------
+# Co-like Recommendations
 # ---------------------------
-def like_member(liker_id, likee_id):
-    if likee_id not in likes_cache:
-        likes_cache[likee_id] = []
-        logging.info(f"Initialized likes list for member ID {likee_id}.")
-    if liker_id not in likes_cache[likee_id]:
-        likes_cache[likee_id].append(liker_id)
+# Sparse, symmetric member x member matrix: co_likes[a][b] is how many members
+# liked both a and b ("people who liked a also liked b").
+co_likes = {}              # { member_id: {other_id: likers in common} }
+co_like_rebuild_log = None  # Changes made while a rebuild runs, replayed on the result
+co_like_stats = {}
+
+def apply_co_like_change(matrix, likee_id, others, delta):
+    row = matrix.setdefault(likee_id, {})
+    for other_id in others:
+        other_row = matrix.setdefault(other_id, {})
+        count = row.get(other_id, 0) + delta
+        if count > 0:
+            row[other_id] = other_row[likee_id] = count
+        else:
+            row.pop(other_id, None)
+            other_row.pop(likee_id, None)
+
+def record_co_like_change(liker_id, likee_id, delta):
+    """Updates co_likes for one like (+1) or unlike (-1) by `liker_id`; O(likes given by liker)."""
+    others = [other_id for other_id in like_graph.liked_by(liker_id) if other_id != likee_id]
+    apply_co_like_change(co_likes, likee_id, others, delta)
+    if co_like_rebuild_log is not None:
+        co_like_rebuild_log.append((likee_id, others, delta))
+
+def build_co_likes(liked_sets):
+    """Builds the co-like matrix from each member's set of liked members."""
+    matrix = {}
+    for liked in liked_sets:
+        liked = list(liked)
+        for index, member_id in enumerate(liked):
+            row = matrix.setdefault(member_id, {})
+            for other_id in liked[index + 1:]:
+                row[other_id] = row.get(other_id, 0) + 1
+                other_row = matrix.setdefault(other_id, {})
+                other_row[member_id] = other_row.get(member_id, 0) + 1
+    return matrix
+
+def co_like_matrix_size(matrix):
+    """Approximate memory used by the matrix, in bytes."""
+    return sys.getsizeof(matrix) + sum(sys.getsizeof(row) for row in matrix.values())
+
+def also_liked(member_id, limit=5):
+    """Members most often liked by the people who liked `member_id`, as (member_id, count)."""
+    return heapq.nlargest(limit, co_likes.get(member_id, {}).items(), key=lambda item: item[1])
+
+def co_like_scores(member_id):
+    """How strongly each member is co-liked with the members `member_id` liked, scaled to 0..1."""
+    scores = {}
+    for liked_id in like_graph.liked_by(member_id):
+        for other_id, count in co_likes.get(liked_id, {}).items():
+            scores[other_id] = scores.get(other_id, 0) + count
+    top = max(scores.values(), default=0)
+    return {other_id: score / top for other_id, score in scores.items()} if top else {}
+
+co_likes = build_co_likes([liked for liked in like_graph.liked.values() if len(liked) > 1])
+
+@tasks.loop(hours=CO_LIKE_REBUILD_HOURS)
+async def rebuild_co_likes():
+    """Rebuilds co_likes from scratch in a worker thread, then swaps it in."""
+    global co_likes, co_like_rebuild_log
+    snapshot = [set(liked) for liked in like_graph.liked.values() if len(liked) > 1]
+    co_like_rebuild_log = []
+    started = time.perf_counter()
+    try:
+        matrix = await asyncio.get_running_loop().run_in_executor(None, build_co_likes, snapshot)
+        # Likes that changed while building were applied to the old matrix; replay them on the new one
+        for likee_id, others, delta in co_like_rebuild_log:
+            apply_co_like_change(matrix, likee_id, others, delta)
+    finally:
+        co_like_rebuild_log = None
+    co_likes = matrix
+
+    co_like_stats.update(
+        built_at=datetime.now().isoformat(timespec="seconds"),
+        build_seconds=round(time.perf_counter() - started, 3),
+        members=len(matrix),
+        entries=sum(len(row) for row in matrix.values()),
+        approx_bytes=co_like_matrix_size(matrix),
+    )
+    logging.info(f"🔁 Co-like matrix rebuilt: {co_like_stats}")
+
+@rebuild_co_likes.before_loop
+async def before_rebuild_co_likes():
+    await bot.wait_until_ready()
+
+# ---------------------------
+# Like Storage
+# ---------------------------
+# Queries are answered by like_graph; changes are also persisted to likes_cache
+# ({ likee_id: [liker_id, ...] }) or, with SQLite, to the likes table.
+def has_liked(liker_id, likee_id):
+    return like_graph.has_liked(liker_id, likee_id)
+
+def add_like(liker_id, likee_id, guild_id=None):
+    """Stores a like; returns False if it was already there."""
+    if not like_graph.add(liker_id, likee_id):
+        return False
+    like_leaderboard.increment(likee_id)
+    record_co_like_change(liker_id, likee_id, 1)
+    if like_graph.has_liked(likee_id, liker_id):
+        link_match(liker_id, likee_id)
+        emit_match_event("created", liker_id, likee_id, guild_id)
+    if sqlite_db:
+        sqlite_db.execute(
+            "INSERT OR IGNORE INTO likes (liker_id, likee_id) VALUES (?, ?)",
+            (liker_id, likee_id)
+        )
+    else:
+        likes_cache.setdefault(likee_id, []).append(liker_id)
         save_likes_cache()
+    return True
+
+def remove_like(liker_id, likee_id, guild_id=None):
+    """Deletes a like; returns False if there was none."""
+    if not like_graph.remove(liker_id, likee_id):
+        return False
+    like_leaderboard.decrement(likee_id)
+    record_co_like_change(liker_id, likee_id, -1)
+    if like_graph.has_liked(likee_id, liker_id):
+        unlink_match(liker_id, likee_id)
+        emit_match_event("broken", liker_id, likee_id, guild_id)
+    if sqlite_db:
+        sqlite_db.execute("DELETE FROM likes WHERE liker_id = ? AND likee_id = ?", (liker_id, likee_id))
+    else:
+        likes_cache[likee_id].remove(liker_id)
+        save_likes_cache()
+    return True
+
+def get_likers(member_id):
+    """Members who liked `member_id`."""
+    return list(like_graph.likers_of(member_id))
+
+def get_liked(member_id):
+    """Members `member_id` has liked."""
+    return list(like_graph.liked_by(member_id))
+
+def get_mutual_likes(member_id):
+    """Members who liked `member_id` and were liked back."""
+    return list(mutual_matches.get(member_id, ()))
+
+def top_liked(limit):
+    """The `limit` most liked members as (member_id, like count), most liked first."""
+    return like_leaderboard.top(limit)
+
+# ---------------------------
+# Match Notifications
+# ---------------------------
+# Match changes are queued as events and DMed by a background consumer,
+# so /like and /unlike answer without waiting on Discord DMs.
+match_events = None  # asyncio.Queue, created on first use inside the running loop
+match_notifier_task = None
+
+def emit_match_event(kind, actor_id, partner_id, guild_id=None):
+    """Queues a "created" or "broken" match between `actor_id` (who acted) and `partner_id`."""
+    global match_events
+    if match_events is None:
+        match_events = asyncio.Queue()
+    match_events.put_nowait({"type": kind, "actor_id": actor_id, "partner_id": partner_id, "guild_id": guild_id})
+
+async def resolve_user(user_id, guild_id=None):
+    """Finds a member (for their server nickname) or falls back to the global user."""
+    guild = bot.get_guild(guild_id) if guild_id else None
+    member = guild.get_member(int(user_id)) if guild else None
+    if member:
+        return member
+    return bot.get_user(int(user_id)) or await bot.fetch_user(int(user_id))
+
+async def send_dm_with_retry(user, message):
+    for attempt in range(MATCH_DM_MAX_RETRIES + 1):
+        try:
+            await user.send(message)
+            return True
+        except discord.Forbidden:
+            logging.warning(f"Could not send DM to {user.display_name}: DMs are closed.")
+            return False
+        except discord.HTTPException as e:
+            if attempt == MATCH_DM_MAX_RETRIES:
+                logging.error(f"Failed to send DM to {user.display_name}: {e}")
+                return False
+            await asyncio.sleep(2 ** attempt)
+
+async def deliver_match_event(event):
+    try:
+        actor = await resolve_user(event["actor_id"], event["guild_id"])
+        partner = await resolve_user(event["partner_id"], event["guild_id"])
+    except discord.HTTPException as e:
+        logging.error(f"Could not resolve members for match event {event}: {e}")
+        return
+
+    if event["type"] == "created":
+        if await send_dm_with_retry(partner, f"🎉 You have a new match! {actor.display_name} liked your profile and you liked theirs."):
+            logging.info(f"Notified {partner.display_name} of a new match with {actor.display_name}.")
+        if await send_dm_with_retry(actor, f"🎉 You have a new match! {partner.display_name} liked your profile and you liked theirs."):
+            logging.info(f"Notified {actor.display_name} of a new match with {partner.display_name}.")
+    elif event["type"] == "broken":
+        if await send_dm_with_retry(partner, f"💔 {actor.display_name} has unliked your profile. Your match is no longer mutual."):
+            logging.info(f"Notified {partner.display_name} of the broken match with {actor.display_name}.")
+
+async def deliver_match_notifications():
+    """Consumes match events forever, keeping at most MATCH_DM_CONCURRENCY deliveries in flight."""
+    global match_events
+    if match_events is None:
+        match_events = asyncio.Queue()
+    semaphore = asyncio.Semaphore(MATCH_DM_CONCURRENCY)
+
+    async def deliver(event):
+        try:
+            await deliver_match_event(event)
+        except Exception as e:
+            logging.error(f"Failed to deliver match event {event}: {e}")
+        finally:
+            semaphore.release()
+
+    while True:
+        event = await match_events.get()
+        await semaphore.acquire()
+        create_background_task(deliver(event))  # Referenced until done, so its semaphore slot is always released
+
+# ---------------------------
+# Likes Management Functions
+# ---------------------------
+def like_member(liker_id, likee_id, guild_id=None):
+    if add_like(liker_id, likee_id, guild_id):
         logging.info(f"Member ID {liker_id} liked Member ID {likee_id}.")
         
         # Check if this creates a mutual match
-        if likee_id in likes_cache.get(liker_id, []):
+        if has_liked(likee_id, liker_id):
             return True  # Indicate that a new mutual match was created
         return True
     logging.warning(f"Member ID {liker_id} attempted to like Member ID {likee_id} again.")
@@ -516,14 +2018,12 @@ def like_member(liker_id, likee_id):
 # ---------------------------
 # Likes Management Functions
 # ---------------------------
-def unlike_member(liker_id, likee_id):
-    if likee_id in likes_cache and liker_id in likes_cache[likee_id]:
-        likes_cache[likee_id].remove(liker_id)
-        save_likes_cache()
+def unlike_member(liker_id, likee_id, guild_id=None):
+    if remove_like(liker_id, likee_id, guild_id):
         logging.info(f"Member ID {liker_id} unliked Member ID {likee_id}.")
         
         # Check if the likee had liked the liker, indicating a mutual match
-        if likee_id in likes_cache.get(liker_id, []):
+        if has_liked(likee_id, liker_id):
             # Since the liker is removing their like, the mutual match is broken
             return 1  # Indicate that a mutual match was broken
         return 2
@@ -534,22 +2034,194 @@ def unlike_member(liker_id, likee_id):
 # get likes
 # ---------------------------
 def get_likes(member_id):
-    result = []
-    for user_id, profile in profile_cache.items():
-        if user_id != member_id and member_id in likes_cache.get(user_id, []):
-            result += [user_id]
-    return result
+    return [likee_id for likee_id in get_liked(member_id) if likee_id != member_id]
 
 # ---------------------------
 # get matches
 # ---------------------------
 def get_matches(member_id):
-    likers = set(likes_cache.get(member_id, []))
-    logging.info(f"likers: {likers}")
-    liked_members = set(get_likes(member_id))
-    logging.info(f"liked: {liked_members}")
-    mutual_matches = liked_members.intersection(likers)
-    return list(mutual_matches)
+    return get_mutual_likes(member_id)
+
+# ---------------------------
+# Match Recommendations
+# ---------------------------
+RECOMMENDER_TEXT_FIELDS = {"geek_out_on": 1.0, "known_for": 1.0, "job": 0.5}  # Field -> weight
+RECOMMENDER_AGE_CENTERS = np.arange(18, 62, 4, dtype=np.float32)  # Soft age buckets
+RECOMMENDER_AGE_WEIGHT = 0.5
+RECOMMENDER_STOPWORDS = {
+    "the", "and", "for", "with", "about", "that", "this", "from", "into", "out",
+    "all", "any", "are", "was", "were", "you", "your", "mine", "our", "their", "n/a"
+}
+
+def profile_feature_vector(profile):
+    """Hashes a profile's text fields into a bag of words plus a soft age encoding, L2-normalized."""
+    vector = np.zeros(RECOMMENDER_FEATURE_DIM + len(RECOMMENDER_AGE_CENTERS), dtype=np.float32)
+    for field, weight in RECOMMENDER_TEXT_FIELDS.items():
+        for token in re.findall(r"[a-z][a-z']+", str(profile.get(field, "")).lower()):
+            if token not in RECOMMENDER_STOPWORDS:
+                vector[zlib.crc32(token.encode()) % RECOMMENDER_FEATURE_DIM] += weight
+
+    text_norm = np.linalg.norm(vector)
+    if text_norm:
+        vector /= text_norm
+
+    age = re.search(r"\d+", str(profile.get("age", "")))
+    if age:
+        # Neighbouring buckets overlap, so close ages score high and distant ones near zero
+        age_part = np.exp(-((int(age.group()) - RECOMMENDER_AGE_CENTERS) / 4) ** 2)
+        vector[RECOMMENDER_FEATURE_DIM:] = RECOMMENDER_AGE_WEIGHT * age_part / np.linalg.norm(age_part)
+
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+class MatchRecommender:
+    """Feature vectors of every cached profile, stacked in one NumPy matrix.
+
+    Rows are updated in place when a profile changes, so ranking candidates is a
+    single matrix-vector product over all profiles.
+    """
+
+    def __init__(self, dim):
+        self.matrix = np.zeros((64, dim), dtype=np.float32)
+        self.member_ids = []  # Row -> member ID
+        self.rows = {}        # Member ID -> row
+
+    def update(self, member_id, profile):
+        row = self.rows.get(member_id)
+        if row is None:
+            row = len(self.member_ids)
+            if row == len(self.matrix):
+                self.matrix = np.concatenate([self.matrix, np.zeros_like(self.matrix)])
+            self.rows[member_id] = row
+            self.member_ids.append(member_id)
+        self.matrix[row] = profile_feature_vector(profile)
+
+    def remove(self, member_id):
+        row = self.rows.pop(member_id, None)
+        if row is None:
+            return
+        # Move the last row into the hole to keep the matrix dense
+        last_id = self.member_ids.pop()
+        if last_id != member_id:
+            self.matrix[row] = self.matrix[len(self.member_ids)]
+            self.member_ids[row] = last_id
+            self.rows[last_id] = row
+
+    def recommend(self, member_id, exclude, limit=5, boost=None):
+        """Best `limit` candidates for `member_id` as (member_id, similarity), skipping `exclude`.
+
+        `boost` maps member IDs to an extra score added before ranking (e.g. co-likes).
+        Members without a profile are ranked on the boost alone, or picked at random,
+        and get a similarity of None.
+        """
+        count = len(self.member_ids)
+        if member_id not in self.rows and not boost:
+            candidates = [other_id for other_id in self.member_ids if other_id not in exclude]
+            return [(other_id, None) for other_id in random.sample(candidates, min(limit, len(candidates)))]
+
+        if member_id in self.rows:
+            similarities = self.matrix[:count] @ self.matrix[self.rows[member_id]]
+        else:
+            similarities = None
+        scores = np.zeros(count, dtype=np.float32) if similarities is None else similarities.copy()
+        for other_id, value in (boost or {}).items():
+            row = self.rows.get(other_id)
+            if row is not None:
+                scores[row] += value
+        for other_id in exclude:
+            row = self.rows.get(other_id)
+            if row is not None:
+                scores[row] = -np.inf
+
+        limit = min(limit, count)
+        if limit == 0:
+            return []
+        best = np.argpartition(-scores, limit - 1)[:limit]
+        best = best[np.argsort(-scores[best])]
+        return [
+            (self.member_ids[row], None if similarities is None else float(similarities[row]))
+            for row in best if scores[row] != -np.inf
+        ]
+
+match_recommender = MatchRecommender(RECOMMENDER_FEATURE_DIM + len(RECOMMENDER_AGE_CENTERS))
+for member_id, profile in profile_cache.items():
+    match_recommender.update(member_id, profile)
+
+# ---------------------------
+# Render Cache
+# ---------------------------
+# Lookup tables and embeds built once instead of on every command
+PROFILE_FIELD_TITLES = {
+    "name": "🔖 **Name:**",
+    "dating_me_like": "💡 **Dating me is like:**",
+    "way_to_heart": "✨ **The way to my heart is:**",
+    "known_for": "🏆 **I’m known for:**",
+    "spontaneous_thing": "🚀 **Most spontaneous thing I’ve done:**",
+    "geek_out_on": "🎮 **I geek out on:**",
+    "age": "🎂 **Age:**",
+    "job": "💼 **Job:**",
+    "funny_fact": "😂 **A funny fact about me:**"
+}
+
+# In-game furnace level -> displayed stove level
+LEVEL_MAPPING = {
+    31: "30-1", 32: "30-2", 33: "30-3", 34: "30-4",
+    35: "FC 1", 36: "FC 1 - 1", 37: "FC 1 - 2", 38: "FC 1 - 3", 39: "FC 1 - 4",
+    40: "FC 2", 41: "FC 2 - 1", 42: "FC 2 - 2", 43: "FC 2 - 3", 44: "FC 2 - 4",
+    45: "FC 3", 46: "FC 3 - 1", 47: "FC 3 - 2", 48: "FC 3 - 3", 49: "FC 3 - 4",
+    50: "FC 4", 51: "FC 4 - 1", 52: "FC 4 - 2", 53: "FC 4 - 3", 54: "FC 4 - 4",
+    55: "FC 5", 56: "FC 5 - 1", 57: "FC 5 - 2", 58: "FC 5 - 3", 59: "FC 5 - 4",
+    60: "FC 6", 61: "FC 6 - 1", 62: "FC 6 - 2", 63: "FC 6 - 3", 64: "FC 6 - 4",
+    65: "FC 7", 66: "FC 7 - 1", 67: "FC 7 - 2", 68: "FC 7 - 3", 69: "FC 7 - 4",
+    70: "FC 8", 71: "FC 8 - 1", 72: "FC 8 - 2", 73: "FC 8 - 3", 74: "FC 8 - 4",
+    75: "FC 9", 76: "FC 9 - 1", 77: "FC 9 - 2", 78: "FC 9 - 3", 79: "FC 9 - 4",
+    80: "FC 10", 81: "FC 10 - 1", 82: "FC 10 - 2", 83: "FC 10 - 3", 84: "FC 10 - 4"
+}
+STOVE_LEVELS_BY_LABEL = {label.replace(" ", "").lower(): stove_lv for stove_lv, label in LEVEL_MAPPING.items()}
+
+def parse_stove_level(text):
+    """Stove level for a label such as "FC 5" or a raw level such as "30"; None if unknown."""
+    text = text.replace(" ", "").lower()
+    if text.isdigit():
+        return int(text)
+    return STOVE_LEVELS_BY_LABEL.get(text)
+
+profile_embeds = {}  # { member_id: (display_name, avatar_url, embed) }
+
+def profile_embed(member):
+    """Profile card for `member`, rebuilt only when their profile, name or avatar changes."""
+    member_id = str(member.id)
+    avatar_url = member.avatar.url if member.avatar else "https://via.placeholder.com/128"
+    cached = profile_embeds.get(member_id)
+    if cached and cached[0] == member.display_name and cached[1] == avatar_url:
+        return cached[2]
+
+    profile_data = profile_cache.get(member_id)
+    embed = discord.Embed(title=f"{member.display_name}", color=discord.Color.blue())
+    for key, value in (profile_data or {}).items():
+        # Fields without an emoji title fall back to their key
+        title = PROFILE_FIELD_TITLES.get(key, key.replace('_', ' ').title())
+        embed.add_field(name=title, value=value, inline=False)
+    embed.set_thumbnail(url=avatar_url)
+
+    if profile_data is not None:
+        profile_embeds[member_id] = (member.display_name, avatar_url, embed)
+    return embed
+
+# ---------------------------
+# Profile Cache Updates
+# ---------------------------
+def store_profile(member_id, profile_data):
+    profile_cache[member_id] = profile_data
+    save_cache()
+    match_recommender.update(member_id, profile_data)
+    profile_embeds.pop(member_id, None)
+
+def delete_profile(member_id):
+    del profile_cache[member_id]
+    save_cache()
+    match_recommender.remove(member_id)
+    profile_embeds.pop(member_id, None)
 
 # ---------------------------
 # Profile Data Validation
@@ -570,11 +2242,16 @@ app = Flask('')
 def home():
     return "I'm alive!"
 
+@app.route('/stats')
+def stats():
+    return {"player_info_cache": player_info_cache.stats(), "roster_sync": roster_sync_stats}
+
 # ---------------------------
 # Discord Bot Events and Commands
 # ---------------------------
 @bot.event
 async def on_ready():
+    global match_notifier_task
     try:
         await tree.sync()  # Force sync all commands
         logging.info(f'✅ Slash commands synced!')
@@ -586,11 +2263,6 @@ async def on_ready():
         
     logging.info(f'Logged in as {bot.user} (ID: {bot.user.id})')
     logging.info('------')
-    # Ensure to check if the scheduler is already running before starting it
-    if not scheduler.running:
-        scheduler.start()
-        logging.info("Scheduler started.")
-    restore_events()
     bot_testing_channel = discord.utils.get(bot.get_all_channels(), name="🤖bot-testing")
 
     if bot_testing_channel:
@@ -600,17 +2272,92 @@ async def on_ready():
             view=ChannelSelectView(bot, bot_testing_channel, all_text_channels)
         )
     
-    check_birthdays.start()  # Start birthday task loop
+    if not warm_profile_pool.is_running():
+        warm_profile_pool.start()  # Start profile warm-up worker
+    if not rebuild_co_likes.is_running():
+        rebuild_co_likes.start()  # Start periodic co-like rebuilds
+    if not sync_roster.is_running():
+        sync_roster.start()  # Start periodic roster sync
+    resume_game_id_campaigns()
+    if match_notifier_task is None:
+        match_notifier_task = asyncio.create_task(deliver_match_notifications())  # Start match DM consumer
 # ---------------------------
 # Generate Profile using Groq
 # ---------------------------
-async def generate_profile_with_groq(member_name):
+async def groq_chat_completion(prompt, timeout=GROQ_TIMEOUT_SECONDS):
+    """Sends a single-message chat completion to Groq over the shared keep-alive pool.
+
+    Returns the completion text, or None if the call failed or timed out.
+    """
     headers = {
         "Content-Type": "application/json",
         "Authorization": f"Bearer {GROQ_API_KEY}"
     }
+    data = {
+        "model": GROQ_MODEL,
+        "messages": [{"role": "user", "content": prompt}],
+    }
+    session = await get_http_session()
+    try:
+        async with session.post(GROQ_API_URL, headers=headers, json=data, timeout=aiohttp.ClientTimeout(total=timeout)) as response:
+            if response.status != 200:
+                logging.error(f"API call failed with status {response.status}: {await response.text()}")
+                return None
+            response_data = await response.json(content_type=None)
+    except asyncio.TimeoutError:
+        logging.error(f"Groq API call timed out after {timeout:.1f}s.")
+        return None
+    except (aiohttp.ClientError, json.JSONDecodeError) as e:
+        logging.error(f"Groq API call failed: {e}")
+        return None
+
+    try:
+        return response_data["choices"][0]["message"]["content"]
+    except (KeyError, IndexError, TypeError) as e:
+        logging.error(f"Index error when accessing response data: {e}. Content may not be properly formatted.")
+        return None
+
+def parse_profile_json(content):
+    """Extracts the JSON block from a completion, with or without ```json fences."""
+    try:
+        # Regex to match content enclosed in triple backticks, json part optional
+        match = re.search(r"```(?:json)?\n?(.+?)\n?```", content, re.DOTALL)
+        json_str = match.group(1) if match else content
+        return json.loads(json_str)
+    except json.JSONDecodeError as e:
+        logging.error(f"JSON decoding failed: {e}. Check the formatting of the JSON string.")
+        return None
+
+async def generate_profile_with_groq(member_name, timeout=GROQ_TIMEOUT_SECONDS):
+    logging.info(f"Generating profile for name: {member_name}")
+    prompt = f"""
+    Create a dating profile for {member_name} with the following fields:
+    - Dating me is like...
+    - The way to my heart is...
+    - I'm known for...
+    - Most spontaneous thing I’ve done...
+    - I geek out on...
+    - Age (random between 22-35)
+    - Job
+    - A funny fact about me...
+    Format the response in JSON with these exact keys: name, dating_me_like, way_to_heart, known_for, spontaneous_thing, geek_out_on, age, job, funny_fact.
+    """
+    content = await groq_chat_completion(prompt, timeout=timeout)
+    if content is None:
+        return None
+    return parse_profile_json(content)
+
+async def generate_profiles_batch_with_groq(member_names, timeout=GROQ_TIMEOUT_SECONDS):
+    """Generates several profiles with one completion; returns a list aligned with `member_names`.
+
+    Entries the model left out or mangled come back as None.
+    """
+    logging.info(f"Generating profiles for names: {member_names}")
+    names = "\n".join(f"{index}. {name}" for index, name in enumerate(member_names, start=1))
     prompt = f"""
-    Create a dating profile for {member_name} with the following fields:
+    Create a dating profile for each of the following people:
+    {names}
+    Each profile has the following fields:
     - Dating me is like...
     - The way to my heart is...
     - I'm known for...
@@ -619,60 +2366,212 @@ async def generate_profile_with_groq(member_name):
     - Age (random between 22-35)
     - Job
     - A funny fact about me...
-    Format the response in JSON with these exact keys: name, dating_me_like, way_to_heart, known_for, spontaneous_thing, geek_out_on, age, job, funny_fact.
+    Format the response as a JSON array with one object per person, in the same order as the list above, each with these exact keys: name, dating_me_like, way_to_heart, known_for, spontaneous_thing, geek_out_on, age, job, funny_fact.
     """
-    data = {
-        "model": "llama-3.3-70b-versatile",
-        "messages": [{"role": "user", "content": prompt}],
-    }
-    response = requests.post(GROQ_API_URL, headers=headers, json=data)
-    if response.status_code == 200:
-        response_data = response.json()
-        try:
-            content = response_data["choices"][0]["message"]["content"]
-            # Regex to match content enclosed in triple backticks, json part optional
-            json_str = re.search(r"```(?:json\n)?(.+?)\n```", content, re.DOTALL).group(1)
-            profile_data = json.loads(json_str)
-            return profile_data
-        except IndexError as e:
-            logging.error(f"Index error when accessing response data: {e}. Content may not be properly formatted.")
-            return None
-        except json.JSONDecodeError as e:
-            logging.error(f"JSON decoding failed: {e}. Check the formatting of the JSON string.")
-            return None
-        except AttributeError as e:
-            logging.error(f"Attribute error during regex search: {e}. Possible incorrect or missing JSON boundaries.")
-            return None
+    content = await groq_chat_completion(prompt, timeout=timeout)
+    profiles = parse_profile_json(content) if content is not None else None
+    if not isinstance(profiles, list):
+        return [None] * len(member_names)
+
+    # Trust the order when the count matches, otherwise fall back to matching names
+    if len(profiles) == len(member_names):
+        return [profile if isinstance(profile, dict) else None for profile in profiles]
+    by_name = {profile.get("name"): profile for profile in profiles if isinstance(profile, dict)}
+    return [by_name.get(name) for name in member_names]
+
+def interaction_time_left(interaction):
+    """Seconds until the interaction token expires and follow-ups are no longer possible."""
+    return (interaction.expires_at - discord.utils.utcnow()).total_seconds()
+
+# ---------------------------
+# Profile Generation Coalescing & Batching
+# ---------------------------
+profile_generations = {}    # { member_id: asyncio.Future } for generations in flight
+pending_profile_batch = []  # [(member_id, member_name)] waiting for the next batch
+profile_batch_timer = None
+
+def finish_profile_generation(member_id, profile_data):
+    """Caches a freshly generated profile and wakes up everyone waiting on it."""
+    if isinstance(profile_data, dict):
+        store_profile(member_id, profile_data)
     else:
-        logging.error(f"API call failed with status {response.status_code}: {response.text}")
-        return None
+        profile_data = None
+    future = profile_generations.pop(member_id, None)
+    if future and not future.done():
+        future.set_result(profile_data)
+
+async def run_profile_generation(member_id, member_name):
+    profile_data = None
+    try:
+        profile_data = await generate_profile_with_groq(member_name)
+    except Exception as e:
+        logging.error(f"Profile generation for {member_name} failed: {e}")
+    finally:
+        finish_profile_generation(member_id, profile_data)
+
+async def flush_profile_batch():
+    global profile_batch_timer
+    if profile_batch_timer:
+        profile_batch_timer.cancel()
+        profile_batch_timer = None
+    batch = pending_profile_batch[:PROFILE_BATCH_SIZE]
+    del pending_profile_batch[:PROFILE_BATCH_SIZE]
+    if not batch:
+        return
+
+    results = [None] * len(batch)
+    try:
+        results = await generate_profiles_batch_with_groq([member_name for _, member_name in batch])
+    except Exception as e:
+        logging.error(f"Batched profile generation failed: {e}")
+
+    for (member_id, member_name), profile_data in zip(batch, results):
+        if isinstance(profile_data, dict):
+            finish_profile_generation(member_id, profile_data)
+        else:
+            # Whatever the batch could not produce is retried on its own
+            create_background_task(run_profile_generation(member_id, member_name))
+
+def enqueue_profile_batch(member_id, member_name):
+    global profile_batch_timer
+    pending_profile_batch.append((member_id, member_name))
+    if len(pending_profile_batch) >= PROFILE_BATCH_SIZE:
+        create_background_task(flush_profile_batch())
+    elif profile_batch_timer is None:
+        profile_batch_timer = asyncio.get_running_loop().call_later(
+            PROFILE_BATCH_WINDOW_MS / 1000, lambda: create_background_task(flush_profile_batch())
+        )
+
+def profile_generation_timeout():
+    """Longest a get_or_generate_profile caller may have to wait, plus a second of slack.
+
+    With batching that is the batch window, the batched call and a retry on its own.
+    """
+    if PROFILE_BATCH_SIZE > 1:
+        return PROFILE_BATCH_WINDOW_MS / 1000 + 2 * GROQ_TIMEOUT_SECONDS + 1
+    return GROQ_TIMEOUT_SECONDS + 1
+
+async def get_or_generate_profile(member_id, member_name):
+    """Returns a member's profile, generating it at most once no matter how many callers ask.
+
+    Concurrent callers for the same member share one in-flight generation. With
+    PROFILE_BATCH_SIZE > 1, generations of different members are grouped into one prompt.
+    Returns None if the profile could not be generated.
+    """
+    if member_id in profile_cache:
+        return profile_cache[member_id]
+
+    future = profile_generations.get(member_id)
+    if future is None:
+        future = asyncio.get_running_loop().create_future()
+        profile_generations[member_id] = future
+        if PROFILE_BATCH_SIZE > 1:
+            enqueue_profile_batch(member_id, member_name)
+        else:
+            create_background_task(run_profile_generation(member_id, member_name))
+
+    # Shielded: a caller giving up must not cancel the generation other callers wait on
+    return await asyncio.shield(future)
+
+# ---------------------------
+# Background Profile Warm-up
+# ---------------------------
+last_interaction_at = 0.0
+warmup_budget = {"date": None, "used": 0}
+
+@bot.listen("on_interaction")
+async def track_interaction_activity(interaction: discord.Interaction):
+    global last_interaction_at
+    last_interaction_at = time.monotonic()
+
+def bot_is_idle():
+    return not profile_generations and time.monotonic() - last_interaction_at >= PROFILE_WARMUP_IDLE_SECONDS
 
+@tasks.loop(minutes=PROFILE_WARMUP_INTERVAL_MINUTES)
+async def warm_profile_pool():
+    """Pre-generates profiles for guild members that don't have one yet, while the bot is idle."""
+    if not bot_is_idle():
+        return
+
+    today = datetime.now().date()
+    if warmup_budget["date"] != today:
+        warmup_budget["date"] = today
+        warmup_budget["used"] = 0
+    remaining = PROFILE_WARMUP_DAILY_BUDGET - warmup_budget["used"]
+    if remaining <= 0:
+        return
+
+    # Members come from the cache the `members` intent keeps up to date
+    candidates = {}
+    for guild in bot.guilds:
+        for member in guild.members:
+            member_id = str(member.id)
+            if member.bot or member_id in profile_cache or member_id in profile_generations:
+                continue
+            candidates[member_id] = member.display_name
+            if len(candidates) >= remaining:
+                break
+        if len(candidates) >= remaining:
+            break
+    if not candidates:
+        return
+
+    semaphore = asyncio.Semaphore(PROFILE_WARMUP_CONCURRENCY)
+    generated = 0
+
+    async def warm_one(member_id, member_name):
+        nonlocal generated
+        async with semaphore:
+            # Back off as soon as users are active again
+            if time.monotonic() - last_interaction_at < PROFILE_WARMUP_IDLE_SECONDS:
+                return
+            warmup_budget["used"] += 1
+            if await get_or_generate_profile(member_id, member_name):
+                generated += 1
+
+    await asyncio.gather(*(warm_one(member_id, member_name) for member_id, member_name in candidates.items()))
+    logging.info(f"🔥 Profile warm-up generated {generated} profiles ({warmup_budget['used']}/{PROFILE_WARMUP_DAILY_BUDGET} used today).")
+
+@warm_profile_pool.before_loop
+async def before_warm_profile_pool():
+    await bot.wait_until_ready()
 
     
 def save_cache():
-    with open(CACHE_FILE, "w") as f:
-        json.dump(profile_cache, f, indent=4)
-    logging.info("Profile cache saved.")
+    profile_store.mark_dirty()
 # ---------------------------
 # Slash Command for gift code
 # ---------------------------
 @tree.command(name="gift_code", description="Redeem a gift code")
 async def gift_code(interaction: discord.Interaction, gift_code: str):
-    player_ids = user_id_map.values()
-    
-    if not player_ids:
+    if not user_id_map:
         await interaction.response.send_message("No players have been mapped yet.", ephemeral=True)
         return
 
+    if gift_code in dead_gift_codes:
+        await interaction.response.send_message(f"❌ Gift code `{gift_code}` was not found by the game server.", ephemeral=True)
+        return
+
+    # Only contact players whose outcome for this code is still unknown or retryable
+    player_ids = [
+        player_id for player_id in user_id_map.values()
+        if redemption_status(gift_code, player_id) not in FINAL_REDEMPTION_STATUSES
+    ]
+    skipped = len(user_id_map) - len(player_ids)
+
+    if not player_ids:
+        await interaction.response.send_message(f"All players have already received the gift code `{gift_code}`.", ephemeral=True)
+        return
+
     # 🔹 Acknowledge the interaction before processing (Prevents "Unknown Interaction" error)
     await interaction.response.defer(thinking=True)  
 
-    response_messages = []
-    
-    for player_id in player_ids:
-        test_player_info(player_id)  # Fetch player info (Not strictly necessary)
-        result = redeem_gift_code(gift_code, player_id)
+    started = time.monotonic()
+    results = await redeem_gift_code_for_players(gift_code, player_ids)
+    elapsed = time.monotonic() - started
 
+    response_messages = []
+    for player_id, result in results.items():
         if result == "SUCCESS":
             response_messages.append(f"✅ `{player_id}`: **Gift code redeemed!**")
         elif result == "ALREADY_RECEIVED":
@@ -684,12 +2583,23 @@ async def gift_code(interaction: discord.Interaction, gift_code: str):
         elif result == "JSON ERROR":
             response_messages.append(f"❌ `{player_id}`: **JSON decoding error.**")
 
-        # Add a delay to avoid hitting rate limits
-        await asyncio.sleep(1)  # Adjust the delay as needed
-
     # 🔹 Send final response after processing all users
     logging.info("\n".join(response_messages))
-    await interaction.followup.send(f"All players have received the gift code `{gift_code}`", ephemeral=True)
+    logging.info(f"🎁 Gift code '{gift_code}' processed for {len(results)} players in {elapsed:.1f}s.")
+
+    redeemed = sum(1 for result in results.values() if result == "SUCCESS")
+    already = sum(1 for result in results.values() if result == "ALREADY_RECEIVED")
+    failed = len(results) - redeemed - already
+    if any(result == "CDK_NOT_FOUND" for result in results.values()):
+        await interaction.followup.send(f"❌ Gift code `{gift_code}` was not found by the game server.", ephemeral=True)
+        return
+
+    await interaction.followup.send(
+        f"🎁 Gift code `{gift_code}` processed for {len(results)} players in {elapsed:.1f}s: "
+        f"✅ {redeemed} redeemed, {already} already redeemed, ❌ {failed} failed"
+        f" ({skipped} skipped, already redeemed in an earlier run).",
+        ephemeral=True
+    )
 
 # ---------------------------
 # Slash Commands to Generate Profile
@@ -704,47 +2614,36 @@ async def profile(interaction: discord.Interaction, member: discord.Member = Non
 
     member_id = str(member.id)
     if member_id not in profile_cache:
-        profile_data = await generate_profile_with_groq(member.display_name)
+        # 🔹 Generation takes longer than Discord's 3 second window, so defer first
+        await interaction.response.defer(thinking=True)
+        timeout = min(profile_generation_timeout(), interaction_time_left(interaction))
+        try:
+            # Stop waiting if generation stalls; the shared generation still fills the cache
+            profile_data = await asyncio.wait_for(get_or_generate_profile(member_id, member.display_name), timeout)
+        except asyncio.TimeoutError:
+            logging.warning(f"Stopped waiting for {member.display_name}'s profile after {timeout:.0f}s.")
+            await interaction.followup.send("⏳ Profile generation is taking longer than expected. Try `/profile` again in a moment.")
+            return
         if not isinstance(profile_data, dict):
-            await interaction.response.send_message("Failed to generate a valid profile. Please try again.")
+            await interaction.followup.send("Failed to generate a valid profile. Please try again.")
             return
-        profile_cache[member_id] = profile_data
-        save_cache()
-
-    profile_data = profile_cache.get(member_id, {})
-    embed = discord.Embed(title=f"{member.display_name}", color=discord.Color.blue())
-    # Define a mapping of field keys to their corresponding emojis and titles
-    field_emojis = {
-        "name": "🔖 **Name:**",
-        "dating_me_like": "💡 **Dating me is like:**",
-        "way_to_heart": "✨ **The way to my heart is:**",
-        "known_for": "🏆 **I’m known for:**",
-        "spontaneous_thing": "🚀 **Most spontaneous thing I’ve done:**",
-        "geek_out_on": "🎮 **I geek out on:**",
-        "age": "🎂 **Age:**",
-        "job": "💼 **Job:**",
-        "funny_fact": "😂 **A funny fact about me:**"
-    }
-
-    for key, value in profile_data.items():
-        # Use get to return the default title if key is not found in field_emojis
-        title = field_emojis.get(key, key.replace('_', ' ').title())
-        embed.add_field(name=title, value=value, inline=False)
 
-    embed.set_thumbnail(url=member.avatar.url if member.avatar else "https://via.placeholder.com/128")
-    await interaction.response.send_message(embed=embed)
+    embed = profile_embed(member)
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed)
+    else:
+        await interaction.response.send_message(embed=embed)
 
 # ---------------------------
 # Slash Command to Reset a Member's Profile (Admins Only)
 # ---------------------------
 @tree.command(name="resetprofile", description="Reset a member's dating profile")
-@commands.has_permissions(administrator=True)
+@discord.app_commands.checks.has_permissions(administrator=True)
 async def reset_profile_command(interaction: discord.Interaction, member: discord.Member):
     member_id = str(member.id)
     
     if member_id in profile_cache:
-        del profile_cache[member_id]
-        save_cache()
+        delete_profile(member_id)
         logging.info(f"Profile for {member.display_name} has been reset.")
         await interaction.response.send_message(f"Profile for {member.display_name} has been reset.")
     else:
@@ -754,56 +2653,47 @@ async def reset_profile_command(interaction: discord.Interaction, member: discor
 # Slash Command to List All Cached Profiles (Admins Only)
 # ---------------------------
 @tree.command(name="listprofiles", description="List all cached dating profiles")
-@commands.has_permissions(administrator=True)
+@discord.app_commands.checks.has_permissions(administrator=True)
 async def list_profiles_command(interaction: discord.Interaction):
     if not profile_cache:
         await interaction.response.send_message("No profiles have been generated yet.")
         return
     
-    embed = discord.Embed(
-        title="📄 Cached Hinge Profiles",
-        color=discord.Color.green()
-    )
-    
-    for member_id, profile in profile_cache.items():
-        member = interaction.guild.get_member(int(member_id))
-        if member:
+    def render_page(member_ids):
+        embed = discord.Embed(
+            title="📄 Cached Hinge Profiles",
+            color=discord.Color.green()
+        )
+        for member_id in member_ids:
+            profile = profile_cache.get(member_id)
+            if profile is None:  # Reset since the list was opened
+                continue
+            member = interaction.guild.get_member(int(member_id))
             embed.add_field(
-                name=f"{member.display_name}",
+                name=member.display_name if member else profile.get('name', f"Unknown ({member_id})"),
                 value=f"**Age:** {profile.get('age', 'N/A')}, **Job:** {profile.get('job', 'N/A')}",
                 inline=False
             )
+        return embed
     
-    await interaction.response.send_message(embed=embed)
+    view = PaginatorView(interaction.user.id, list(profile_cache), render_page)
+    await interaction.response.send_message(embed=view.embed(), view=view)
 # ---------------------------
 # Slash Command to see scheduled Event
 # ---------------------------
 @tree.command(name="list_scheduled_events", description="View all scheduled events for this channel")
 async def list_scheduled_events(interaction: discord.Interaction):
     event_list = []
-    channel_id = interaction.channel_id
-    guild_id = interaction.guild_id
-
-    for job in scheduler.get_jobs():
-        if job.id.startswith(f"{guild_id}_"):  # Ensure it's an event from this server
-            trigger = job.trigger
-            event_name = job.id.split("_", 1)[1]  # Extract event name
-
-            if isinstance(trigger, CronTrigger):
-                # Weekly event
-                event_type = "Weekly"
-                schedule_info = f"Every {trigger.fields[4]} at {trigger.fields[2]}:{trigger.fields[1]}"
-            elif isinstance(trigger, IntervalTrigger):
-                # Interval-based event
-                event_type = "Interval"
-                schedule_info = f"Every {trigger.interval_length} {trigger.interval}"
-            else:
-                continue  # Skip unknown trigger types
-            # Extract message argument from job
-            job_args = job.args
-            if len(job_args) > 1 and job_args[0] == channel_id:  # Ensure message is for the same channel
-                event_message = job_args[1]
-                event_list.append(f"**{event_name}**\n> **Type:** {event_type}\n> **Schedule:** {schedule_info}\n> **Message:** {event_message}")
+    guild_prefix = f"{interaction.guild_id}_"
+
+    # Only this channel's events are looked at
+    for event_id, data in event_registry.in_channel(interaction.channel_id):
+        if not event_id.startswith(guild_prefix):
+            continue  # Ensure it's an event from this server
+        event_name = event_id.split("_", 1)[1]  # Extract event name
+        event_type, schedule_info = describe_event_schedule(data)
+        channels = ", ".join(f"<#{channel_id}>" for channel_id in event_channel_ids(data))
+        event_list.append(f"**{event_name}**\n> **Type:** {event_type}\n> **Schedule:** {schedule_info}\n> **Channels:** {channels}\n> **Message:** {data['message']}")
 
     if event_list:
         event_display = "\n\n".join(event_list)
@@ -819,14 +2709,15 @@ async def list_scheduled_events(interaction: discord.Interaction):
 @tree.command(name="schedule_event", description="Schedule a recurring event with a unique name and custom notification message")
 @discord.app_commands.describe(
     event_name="Name of the event",
-    mode="Choose 'weekly' (specific day & time) or 'interval' (every X time units)",
-    day_of_week="(For 'weekly' mode) Day of the week (e.g., monday, tuesday, etc.)",
-    time="(For 'weekly' mode) Time of the event (HH:MM format, 24-hour)",
+    mode="Choose 'weekly' (specific day & time), 'interval' (every X time units) or 'reset' (time after the game reset)",
+    day_of_week="(For 'weekly' mode, optional for 'reset') Day of the week (e.g., monday, tuesday, etc.)",
+    time="(For 'weekly' mode) Time of the event; (for 'reset' mode) time after the reset (HH:MM format, 24-hour)",
     interval_value="(For 'interval' mode) Number of units between notifications",
     interval_unit="(For 'interval' mode) Unit: minutes, hours, or days",
     start_date="(For 'interval' mode) Starting date (YYYY-MM-DD format)",
     start_time="(For 'interval' mode) Starting time (HH:MM format, 24-hour)",
-    message="Custom message to send when notifying"
+    message="Message to send; may use $event, $next and $countdown",
+    timezone="Timezone of the times above, e.g. Europe/Berlin (defaults to the server's, see /set_timezone)"
 )
 async def schedule_event(
     interaction: discord.Interaction,
@@ -838,10 +2729,17 @@ async def schedule_event(
     interval_unit: str = None,
     start_date: str = None,
     start_time: str = None,
-    message: str = None
+    message: str = None,
+    timezone: str = None
 ):
     event_id = f"{interaction.guild_id}_{event_name}"
-    events = load_events()
+
+    try:
+        tz_name = timezone or guild_timezone(interaction.guild_id)
+        tz = ZoneInfo(tz_name)
+    except (ZoneInfoNotFoundError, ValueError):
+        await interaction.response.send_message(f"Unknown timezone `{timezone}`. Use a name like `Europe/Berlin` or `UTC`.", ephemeral=True)
+        return
 
     try:
         if mode.lower() == "weekly":
@@ -849,58 +2747,74 @@ async def schedule_event(
                 await interaction.response.send_message("For weekly scheduling, provide `day_of_week` and `time` (HH:MM).", ephemeral=True)
                 return
 
-            hour, minute = map(int, time.split(":"))
-            trigger = CronTrigger(day_of_week=day_of_week.lower(), hour=hour, minute=minute)
+            hour, minute = parse_hhmm(time)
 
-            events[event_id] = {
+            event_data = {
                 "mode": "weekly",
                 "channel_id": interaction.channel_id,
                 "day_of_week": day_of_week.lower(),
                 "hour": hour,
                 "minute": minute,
+                "timezone": tz_name,
                 "message": message
             }
 
-            scheduler.add_job(notify_event, trigger, args=[interaction.channel_id, message], id=event_id, replace_existing=True)
-            await interaction.response.send_message(f"Scheduled event '{event_name}' for every {day_of_week} at {time}.")
+            put_event(event_id, event_data)
+            await interaction.response.send_message(f"Scheduled event '{event_name}' for every {day_of_week} at {time} ({tz_name}).")
 
         elif mode.lower() == "interval":
             if not interval_value or not interval_unit or not start_date or not start_time:
                 await interaction.response.send_message("For interval scheduling, provide `interval_value`, `interval_unit`, `start_date` (YYYY-MM-DD), and `start_time` (HH:MM).", ephemeral=True)
                 return
 
-            # Parse start date and time
+            # Parse start date and time in the event's timezone
             start_datetime = datetime.strptime(f"{start_date} {start_time}", "%Y-%m-%d %H:%M")
-            now = datetime.utcnow()
+            now = datetime.now(tz).replace(tzinfo=None)
 
             if start_datetime < now:
                 await interaction.response.send_message("The start date and time must be in the future.", ephemeral=True)
                 return
 
-            unit_mapping = {"minutes": "minutes", "hours": "hours", "days": "days"}
-            if interval_unit.lower() not in unit_mapping:
+            if interval_unit.lower() not in INTERVAL_UNITS:
                 await interaction.response.send_message("Invalid `interval_unit`. Choose 'minutes', 'hours', or 'days'.", ephemeral=True)
                 return
 
-            trigger = IntervalTrigger(**{unit_mapping[interval_unit.lower()]: interval_value}, start_date=start_datetime)
-
-            events[event_id] = {
+            event_data = {
                 "mode": "interval",
                 "channel_id": interaction.channel_id,
                 "interval_value": interval_value,
                 "interval_unit": interval_unit.lower(),
                 "start_date": start_datetime.strftime("%Y-%m-%d"),
                 "start_time": start_datetime.strftime("%H:%M"),
+                "timezone": tz_name,
                 "message": message
             }
 
-            scheduler.add_job(notify_event, trigger, args=[interaction.channel_id, message], id=event_id, replace_existing=True)
-            await interaction.response.send_message(f"Scheduled event '{event_name}' to repeat every {interval_value} {interval_unit} starting on {start_date} at {start_time}.")
+            put_event(event_id, event_data)
+            await interaction.response.send_message(f"Scheduled event '{event_name}' to repeat every {interval_value} {interval_unit} starting on {start_date} at {start_time} ({tz_name}).")
 
-        else:
-            await interaction.response.send_message("Invalid mode. Choose 'weekly' or 'interval'.", ephemeral=True)
+        elif mode.lower() == "reset":
+            if not time:
+                await interaction.response.send_message("For reset scheduling, provide `time` as the delay after the game reset (HH:MM), and optionally `day_of_week`.", ephemeral=True)
+                return
+
+            offset_hour, offset_minute = parse_hhmm(time)
+
+            event_data = {
+                "mode": "reset",
+                "channel_id": interaction.channel_id,
+                "day_of_week": day_of_week.lower() if day_of_week else None,
+                "offset_hour": offset_hour,
+                "offset_minute": offset_minute,
+                "message": message
+            }
+
+            put_event(event_id, event_data)
+            days = f"every {day_of_week}" if day_of_week else "every day"
+            await interaction.response.send_message(f"Scheduled event '{event_name}' {days}, {time} after the game reset.")
 
-        save_events(events)
+        else:
+            await interaction.response.send_message("Invalid mode. Choose 'weekly', 'interval' or 'reset'.", ephemeral=True)
 
     except Exception as e:
         logging.error(f"Failed to schedule event: {str(e)}")
@@ -913,20 +2827,49 @@ async def schedule_event(
 @discord.app_commands.describe(event_name="Name of the event")
 async def remove_event(interaction: discord.Interaction, event_name: str):
     event_id = f"{interaction.guild_id}_{event_name}"
-    events = load_events()
 
-    if event_id in events:
-        # Remove the event from the scheduler
-        if scheduler.get_job(event_id):
-            scheduler.remove_job(event_id)
-
-        # Remove the event from the cache
-        del events[event_id]
-        save_events(events)
+    if event_id in event_registry:
+        # Remove the event from the scheduler and the registry
+        delete_event(event_id)
         await interaction.response.send_message(f"Event '{event_name}' has been removed from the schedule and cache.")
     else:
         await interaction.response.send_message(f"No event found with name '{event_name}'.")
 
+# ---------------------------
+# Slash Commands to Add or Remove an Event's Channels
+# ---------------------------
+@tree.command(name="event_add_channel", description="Also post a scheduled event in another channel")
+@discord.app_commands.describe(event_name="Name of the event", channel="Channel to add")
+async def event_add_channel(interaction: discord.Interaction, event_name: str, channel: discord.TextChannel):
+    event_id = f"{interaction.guild_id}_{event_name}"
+    data = event_registry.get(event_id)
+    if not data:
+        await interaction.response.send_message(f"No event found with name '{event_name}'.", ephemeral=True)
+        return
+
+    channel_ids = event_channel_ids(data)
+    if channel.id in channel_ids:
+        await interaction.response.send_message(f"Event '{event_name}' already posts in {channel.mention}.", ephemeral=True)
+        return
+    put_event(event_id, dict(data, channel_ids=channel_ids + [channel.id]))
+    await interaction.response.send_message(f"Event '{event_name}' will now also post in {channel.mention}.")
+
+@tree.command(name="event_remove_channel", description="Stop posting a scheduled event in a channel")
+@discord.app_commands.describe(event_name="Name of the event", channel="Channel to remove")
+async def event_remove_channel(interaction: discord.Interaction, event_name: str, channel: discord.TextChannel):
+    event_id = f"{interaction.guild_id}_{event_name}"
+    data = event_registry.get(event_id)
+    if not data or channel.id not in event_channel_ids(data):
+        await interaction.response.send_message(f"Event '{event_name}' does not post in {channel.mention}.", ephemeral=True)
+        return
+
+    channel_ids = [channel_id for channel_id in event_channel_ids(data) if channel_id != channel.id]
+    if not channel_ids:
+        await interaction.response.send_message("An event needs at least one channel. Use `/remove_event` to delete it.", ephemeral=True)
+        return
+    put_event(event_id, dict(data, channel_id=channel_ids[0], channel_ids=channel_ids))
+    await interaction.response.send_message(f"Event '{event_name}' will no longer post in {channel.mention}.")
+
 # ---------------------------
 # Slash Command to Check Next Occurrence of an Event
 # ---------------------------
@@ -934,24 +2877,218 @@ async def remove_event(interaction: discord.Interaction, event_name: str):
 @discord.app_commands.describe(event_name="Name of the event")
 async def next_event(interaction: discord.Interaction, event_name: str):
     event_id = f"{interaction.guild_id}_{event_name}"
-    job = scheduler.get_job(event_id)
 
-    if job:
-        next_run_time = job.next_run_time
+    if event_id in event_registry:
+        next_run_time = event_calendar.next_run(event_id)  # Precomputed, no trigger evaluation
         if next_run_time:
-            await interaction.response.send_message(f"The next occurrence of event '{event_name}' is scheduled for {next_run_time}.")
+            timestamp = int(next_run_time.timestamp())
+            await interaction.response.send_message(f"The next occurrence of event '{event_name}' is scheduled for <t:{timestamp}:F> (<t:{timestamp}:R>).")
         else:
             await interaction.response.send_message(f"The event '{event_name}' does not have a next run time.")
     else:
         await interaction.response.send_message(f"No event found with name '{event_name}'.")
 
+# ---------------------------
+# Slash Command to List This Server's Upcoming Events
+# ---------------------------
+@tree.command(name="upcoming_events", description="View this server's upcoming event occurrences")
+@discord.app_commands.describe(days="How many days ahead to look (default 7)")
+async def upcoming_events(interaction: discord.Interaction, days: int = 7):
+    days = max(1, min(days, EVENT_CALENDAR_DAYS))
+    entries = event_calendar.upcoming(interaction.guild_id, days)  # Served from the precomputed calendar
+    if not entries:
+        await interaction.response.send_message(f"No events in the next {days} days.")
+        return
+
+    def render_page(page):
+        lines = [
+            f"<t:{int(run_time.timestamp())}:f> - **{event_id.split('_', 1)[1]}**"
+            for run_time, event_id in page
+        ]
+        return discord.Embed(title=f"🗓 Events in the Next {days} Days", description="\n".join(lines), color=discord.Color.blue())
+
+    view = PaginatorView(interaction.user.id, entries, render_page)
+    await interaction.response.send_message(embed=view.embed(), view=view)
+
+# ---------------------------
+# Slash Command to Set the Server's Timezone
+# ---------------------------
+@tree.command(name="set_timezone", description="Set the timezone new events are scheduled in")
+@discord.app_commands.checks.has_permissions(administrator=True)
+@discord.app_commands.describe(timezone="IANA timezone name, e.g. Europe/Berlin, America/New_York or UTC")
+async def set_timezone(interaction: discord.Interaction, timezone: str):
+    try:
+        ZoneInfo(timezone)
+    except (ZoneInfoNotFoundError, ValueError):
+        await interaction.response.send_message(f"Unknown timezone `{timezone}`. Use a name like `Europe/Berlin` or `UTC`.", ephemeral=True)
+        return
+
+    guild_id = str(interaction.guild_id)
+    guild_settings[guild_id] = dict(guild_settings.get(guild_id, {}), timezone=timezone)
+    guild_settings_store.mark_dirty()
+    await interaction.response.send_message(f"🕒 New events will be scheduled in **{timezone}**. Existing events keep their timezone.")
+
+# ---------------------------
+# Slash Commands to Import and Export Events
+# ---------------------------
+# One JSON object per line: "name", "mode" and the mode's fields as stored in event_registry,
+# plus optional "channel_ids", "timezone" and "message". /export_events writes the same format.
+EVENT_MODE_FIELDS = {
+    "weekly": {"day_of_week": str, "hour": int, "minute": int},
+    "interval": {"interval_value": int, "interval_unit": str, "start_date": str, "start_time": str},
+    "reset": {"offset_hour": int, "offset_minute": int},
+}
+
+def parse_event_row(row, guild, default_channel_id):
+    """Validates one imported event and returns (event_id, data); raises ValueError saying what is wrong."""
+    if not isinstance(row, dict):
+        raise ValueError("not a JSON object")
+    name = row.get("name")
+    if not isinstance(name, str) or not name.strip():
+        raise ValueError("missing `name`")
+    mode = str(row.get("mode", "")).lower()
+    if mode not in EVENT_MODE_FIELDS:
+        raise ValueError(f"unknown mode {row.get('mode')!r}, use 'weekly', 'interval' or 'reset'")
+
+    data = {"mode": mode}
+    for field, kind in EVENT_MODE_FIELDS[mode].items():
+        value = row.get(field)
+        if not isinstance(value, kind) or isinstance(value, bool):
+            raise ValueError(f"`{field}` must be a {'number' if kind is int else 'string'}")
+        data[field] = value.lower() if field in ("day_of_week", "interval_unit") else value
+    if mode == "weekly":
+        parse_hhmm(f"{data['hour']}:{data['minute']}")
+    elif mode == "interval" and data["interval_value"] < 1:
+        raise ValueError("`interval_value` must be at least 1")
+    elif mode == "reset":
+        parse_hhmm(f"{data['offset_hour']}:{data['offset_minute']}")
+        data["day_of_week"] = str(row["day_of_week"]).lower() if row.get("day_of_week") else None
+
+    channel_ids = row.get("channel_ids") or [default_channel_id]
+    for channel_id in channel_ids:
+        if not isinstance(channel_id, int) or guild.get_channel(channel_id) is None:
+            raise ValueError(f"channel {channel_id} is not in this server")
+    data["channel_id"] = channel_ids[0]
+    data["channel_ids"] = list(dict.fromkeys(channel_ids))
+    for field in ("timezone", "message"):
+        if row.get(field) is not None and not isinstance(row[field], str):
+            raise ValueError(f"`{field}` must be a string")
+    if mode != "reset":
+        data["timezone"] = row.get("timezone") or guild_timezone(guild.id)
+    data["message"] = row.get("message")
+
+    try:
+        event_trigger(data)  # The same check the scheduler would make, before anything is stored
+    except (ValueError, ZoneInfoNotFoundError) as e:
+        raise ValueError(f"invalid schedule: {e}")
+    return f"{guild.id}_{name.strip()}", data
+
+@tree.command(name="export_events", description="Download this server's scheduled events as a file")
+async def export_events(interaction: discord.Interaction):
+    lines = []
+    for event_id, data in event_registry.in_guild(interaction.guild_id):
+        row = {"name": event_id.split("_", 1)[1]}
+        row.update((key, value) for key, value in data.items() if key != "channel_id")
+        row["channel_ids"] = event_channel_ids(data)
+        if data["mode"] != "reset":
+            row["timezone"] = str(event_timezone(data))  # Pins older events to the zone they run in
+        lines.append(json.dumps(row))
+    if not lines:
+        await interaction.response.send_message("No scheduled events to export.", ephemeral=True)
+        return
+
+    export_file = discord.File(io.BytesIO("\n".join(lines).encode()), filename="events.jsonl")
+    await interaction.response.send_message(f"📤 Exported {len(lines)} events. Edit the file and load it with `/import_events`.", file=export_file, ephemeral=True)
+
+@tree.command(name="import_events", description="Schedule many events at once from a JSON lines file")
+@discord.app_commands.checks.has_permissions(administrator=True)
+@discord.app_commands.describe(file="A .jsonl file with one event per line, as written by /export_events")
+async def import_events(interaction: discord.Interaction, file: discord.Attachment):
+    await interaction.response.defer(thinking=True)
+    started = time.perf_counter()
+    try:
+        lines = (await file.read()).decode("utf-8").splitlines()
+    except (discord.HTTPException, UnicodeDecodeError) as e:
+        await interaction.followup.send(f"❌ Could not read `{file.filename}`: {e}")
+        return
+
+    rows = [(line_number, line) for line_number, line in enumerate(lines, 1) if line.strip()]
+    if not rows:
+        await interaction.followup.send(f"❌ `{file.filename}` has no events.")
+        return
+    if len(rows) > EVENT_IMPORT_MAX_ROWS:
+        await interaction.followup.send(f"❌ `{file.filename}` has {len(rows)} events; at most {EVENT_IMPORT_MAX_ROWS} can be imported at once.")
+        return
+
+    # Every row is validated before anything is applied
+    events, results, errors = [], [], 0
+    seen = {}  # { event_id: line number }
+    for line_number, line in rows:
+        try:
+            event_id, data = parse_event_row(json.loads(line), interaction.guild, interaction.channel_id)
+            if event_id in seen:
+                raise ValueError(f"same name as line {seen[event_id]}")
+        except ValueError as e:
+            results.append(f"Line {line_number}: ❌ {e}")
+            errors += 1
+            continue
+        seen[event_id] = line_number
+        events.append((event_id, data))
+        status = "updated" if event_id in event_registry else "added"
+        results.append(f"Line {line_number}: ✅ {event_id.split('_', 1)[1]} ({status})")
+
+    if errors:
+        summary = f"❌ {errors} of {len(rows)} lines are invalid, so no events were imported."
+    else:
+        try:
+            put_events(events)  # One batch: all events or none
+        except Exception as e:
+            logging.error(f"Failed to import events: {str(e)}")
+            await interaction.followup.send(f"❌ Failed to import events, nothing was changed: {str(e)}")
+            return
+        summary = f"📥 Imported {len(events)} events in {(time.perf_counter() - started) * 1000:.0f} ms."
+        logging.info(f"📥 Imported {len(events)} events into guild {interaction.guild_id}.")
+
+    report = discord.File(io.BytesIO("\n".join(results).encode()), filename="import_results.txt")
+    first_errors = [result for result in results if "❌" in result][:5]
+    await interaction.followup.send("\n".join([summary, *first_errors]), file=report)
+
 # ---------------------------
 # Notify Event
 # ---------------------------
-async def notify_event(channel_id, message):
-    channel = bot.get_channel(channel_id)
-    if channel:
-        await channel.send(message)
+# Messages are string.Template text: $event, $next (date of the next occurrence) and $countdown.
+# Unknown names are left as written; $$ renders as a single $.
+def render_event_message(event_id, data):
+    next_run = event_calendar.next_run(event_id)  # Not the one firing now
+    variables = {"event": event_id.split("_", 1)[1]}
+    if next_run:
+        variables["next"] = f"<t:{int(next_run.timestamp())}:F>"       # Rendered in each reader's timezone
+        variables["countdown"] = f"<t:{int(next_run.timestamp())}:R>"  # "in 2 days"
+    return string.Template(data["message"] or "").safe_substitute(variables)
+
+async def send_event_message(channel_id, message, semaphore):
+    channel = bot.get_channel(int(channel_id))
+    if not channel:
+        logging.warning(f"⚠ Event channel {channel_id} not found.")
+        return False
+    async with semaphore:
+        try:
+            # discord.py waits out each channel's rate limit bucket, so channels never block each other
+            await channel.send(message)
+            return True
+        except discord.HTTPException as e:
+            logging.error(f"❌ Could not post event message in {channel_id}: {e}")
+            return False
+
+async def fire_event(event_id):
+    """Scheduler job: renders the event's message once and posts it to all of its channels in parallel."""
+    data = event_registry.get(event_id)
+    if not data:
+        return  # Removed since the job was scheduled
+    message = render_event_message(event_id, data)
+    semaphore = asyncio.Semaphore(EVENT_SEND_CONCURRENCY)
+    results = await asyncio.gather(*(send_event_message(channel_id, message, semaphore) for channel_id in event_channel_ids(data)))
+    logging.info(f"📣 Event '{event_id}' posted to {sum(results)}/{len(results)} channels.")
 
 # ---------------------------
 # Slash Command to Add a Mapping
@@ -964,32 +3101,34 @@ async def add_game_id(interaction: discord.Interaction, member: discord.Member,
 
 
 class AddGameIDView(View):
-    def __init__(self, member):
+    """The "Add Game ID" button, routed by whoever clicks it (a DM can only be clicked by its recipient)."""
+
+    def __init__(self):
         super().__init__(timeout=None)
-        self.member = member
 
-    @discord.ui.button(label="Add Game ID", style=discord.ButtonStyle.green)
+    @discord.ui.button(label="Add Game ID", style=discord.ButtonStyle.green, custom_id="add_game_id")
     async def add_game_id_button(self, interaction: discord.Interaction, button: Button):
-        if interaction.user != self.member:
-            await interaction.response.send_message("This button is not for you!", ephemeral=True)
-            return
-
+        member = interaction.user
         await interaction.response.send_message("Please reply with your game ID.", ephemeral=True)
 
         def check(m):
-            return m.author == self.member and m.channel == interaction.channel
+            return m.author == member and m.channel == interaction.channel
 
         try:
             response = await interaction.client.wait_for("message", check=check, timeout=60)
-            game_id = response.content
+            game_id = response.content.strip()
 
-            user_id_map[str(self.member.id)] = int(game_id)
+            user_id_map[str(member.id)] = int(game_id)
             save_id_map()
 
             await interaction.followup.send(f"✅ Your game ID `{game_id}` has been added!", ephemeral=True)
-        except TimeoutError:
+        except ValueError:
+            await interaction.followup.send("❌ A game ID is a number. Please click the button and try again.", ephemeral=True)
+        except asyncio.TimeoutError:
             await interaction.followup.send("⏳ You took too long to respond. Please try again.", ephemeral=True)
 
+game_id_prompt_view = None  # Created in WhiteoutBot.setup_hook
+
 async def on_member_join(member):
     if member.bot:
         return  # Skip bots
@@ -997,32 +3136,135 @@ async def on_member_join(member):
     member_id = str(member.id)
     if member_id not in user_id_map:
         try:
-            view = AddGameIDView(member)
             await member.send(
                 "Welcome to the server! You are not mapped to any game ID in our system. "
                 "Click the button below to add your game ID.",
-                view=view
+                view=game_id_prompt_view
             )
         except discord.Forbidden:
             print(f"Could not send DM to {member.display_name}.")
 
-async def check_and_request_game_ids(guild):
-    for member in guild.members:
-        if member.bot:
-            continue  # Skip bots
+# -----------------------------------
+# Game ID DM Campaign
+# -----------------------------------
+# Append-only log of campaign progress, replayed at startup so a campaign resumes where it stopped.
+# One JSON object per line: {"campaign": id, "user": user_id, "status": status}
+# or {"campaign": id, "guild": guild_id, "state": "started" | "finished"}.
+DM_CAMPAIGN_LOG_FILE = "dm_campaigns.jsonl"
+FINAL_CAMPAIGN_STATUSES = {"sent", "closed"}  # "failed" members are retried on the next run
+
+dm_campaigns = {}          # { campaign_id: { "user_id": status } }
+unfinished_campaigns = {}  # { campaign_id: guild_id }
+campaign_tasks = {}        # { campaign_id: task } for campaigns running now
+dm_campaign_bucket = TokenBucket(DM_CAMPAIGN_RATE_PER_SECOND, DM_CAMPAIGN_CONCURRENCY)
+
+GAME_ID_PROMPT = (
+    "Hello! You are currently not mapped to any game ID in our system. "
+    "Adding your game ID will allow you to use certain features such as showing your game profile and moreover it will allow for autoredemption of the gift codes. "
+    "Click the button below to add your game ID."
+)
+
+def apply_campaign_entry(entry):
+    if "state" in entry:
+        if entry["state"] == "started":
+            unfinished_campaigns[entry["campaign"]] = entry["guild"]
+        else:
+            unfinished_campaigns.pop(entry["campaign"], None)
+    else:
+        dm_campaigns.setdefault(entry["campaign"], {})[str(entry["user"])] = entry["status"]
 
-        member_id = str(member.id)
-        if member_id not in user_id_map:
+if os.path.exists(DM_CAMPAIGN_LOG_FILE):
+    with open(DM_CAMPAIGN_LOG_FILE, "r") as f:
+        for line in f:
             try:
-                view = AddGameIDView(member)
-                await member.send(
-                    "Hello! You are currently not mapped to any game ID in our system. "
-                    "Adding your game ID will allow you to use certain features such as showing your game profile and moreover it will allow for autoredemption of the gift codes. "
-                    "Click the button below to add your game ID.",
-                    view=view
-                )
-            except discord.Forbidden:
-                print(f"Could not send DM to {member.display_name}.")
+                apply_campaign_entry(json.loads(line))
+            except (json.JSONDecodeError, KeyError):
+                logging.warning(f"Skipping malformed DM campaign line: {line.strip()}")
+    logging.info(f"DM campaign log loaded ({len(dm_campaigns)} campaigns, {len(unfinished_campaigns)} unfinished).")
+
+def append_campaign_entry(entry):
+    apply_campaign_entry(entry)
+    with open(DM_CAMPAIGN_LOG_FILE, "a") as f:
+        f.write(json.dumps(entry) + "\n")
+
+async def send_campaign_dm(member):
+    """Sends the game ID prompt to one member and returns "sent", "closed" or "failed"."""
+    await dm_campaign_bucket.acquire()
+    try:
+        await member.send(GAME_ID_PROMPT, view=game_id_prompt_view)
+        return "sent"
+    except discord.Forbidden:
+        return "closed"  # DMs are closed; asking again will not help
+    except discord.HTTPException as e:
+        if e.status == 429:
+            # discord.py already waited and retried; slow the whole campaign down as well
+            try:
+                retry_after = float(e.response.headers.get("Retry-After", 5))
+            except ValueError:
+                retry_after = 5
+            dm_campaign_bucket.penalize(retry_after)
+        logging.warning(f"Could not send DM to {member.display_name}: {e}")
+        return "failed"
+
+async def check_and_request_game_ids(guild):
+    """DMs every unmapped member of `guild` the game ID prompt, skipping those already contacted.
+
+    Progress is checkpointed per member, so a stopped campaign picks up where it left off.
+    """
+    campaign_id = f"game_ids_{guild.id}"
+    contacted = dm_campaigns.get(campaign_id, {})
+    pending = (
+        member for member in guild.members
+        if not member.bot
+        and str(member.id) not in user_id_map
+        and contacted.get(str(member.id)) not in FINAL_CAMPAIGN_STATUSES
+    )
+    counts = {"sent": 0, "closed": 0, "failed": 0}
+
+    async def worker():
+        # Workers share one generator, so each member is handed out once
+        for member in pending:
+            status = await send_campaign_dm(member)
+            counts[status] += 1
+            append_campaign_entry({"campaign": campaign_id, "user": str(member.id), "status": status})
+
+    append_campaign_entry({"campaign": campaign_id, "guild": guild.id, "state": "started"})
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(DM_CAMPAIGN_CONCURRENCY)))
+    append_campaign_entry({"campaign": campaign_id, "guild": guild.id, "state": "finished"})
+    logging.info(f"📨 Game ID campaign for {guild.name} finished in {time.perf_counter() - started:.1f}s: {counts}")
+    return counts
+
+def start_game_id_campaign(guild):
+    """Runs check_and_request_game_ids in the background; returns False if it is already running."""
+    campaign_id = f"game_ids_{guild.id}"
+    if campaign_id in campaign_tasks:
+        return False
+    task = asyncio.create_task(check_and_request_game_ids(guild))
+    campaign_tasks[campaign_id] = task
+    task.add_done_callback(lambda _: campaign_tasks.pop(campaign_id, None))
+    return True
+
+def resume_game_id_campaigns():
+    """Restarts campaigns that were interrupted by a restart."""
+    for campaign_id, guild_id in list(unfinished_campaigns.items()):
+        guild = bot.get_guild(int(guild_id))
+        if guild and start_game_id_campaign(guild):
+            logging.info(f"📨 Resuming game ID campaign for {guild.name}.")
+
+@tree.command(name="request_game_ids", description="DM every unmapped member a button to add their game ID")
+@discord.app_commands.checks.has_permissions(administrator=True)
+async def request_game_ids_command(interaction: discord.Interaction):
+    campaign_id = f"game_ids_{interaction.guild_id}"
+    contacted = sum(1 for status in dm_campaigns.get(campaign_id, {}).values() if status in FINAL_CAMPAIGN_STATUSES)
+    if not start_game_id_campaign(interaction.guild):
+        await interaction.response.send_message(f"⏳ A campaign is already running ({contacted} members contacted so far).", ephemeral=True)
+        return
+    await interaction.response.send_message(
+        f"📨 Sending game ID requests to unmapped members ({contacted} already contacted are skipped).",
+        ephemeral=True
+    )
+
 # -----------------------------------
 # 📌 Slash Command to Remove a Mapping
 # -----------------------------------
@@ -1044,13 +3286,19 @@ async def list_game_ids(interaction: discord.Interaction):
         await interaction.response.send_message("ℹ No players have been mapped yet.", ephemeral=True)
         return
     
-    message = "**🎮 Player ID Mappings:**\n"
-    for discord_id, game_id in user_id_map.items():
-        member = interaction.guild.get_member(int(discord_id))
-        member_name = member.display_name if member else f"Unknown ({discord_id})"
-        message += f"🔹 **{member_name}** → `{game_id}`\n"
-
-    await interaction.response.send_message(message, ephemeral=True)
+    def render_page(discord_ids):
+        lines = []
+        for discord_id in discord_ids:
+            game_id = user_id_map.get(discord_id)
+            if game_id is None:  # Removed since the list was opened
+                continue
+            member = interaction.guild.get_member(int(discord_id))
+            member_name = member.display_name if member else f"Unknown ({discord_id})"
+            lines.append(f"🔹 **{member_name}** → `{game_id}`")
+        return discord.Embed(title="🎮 Player ID Mappings", description="\n".join(lines), color=discord.Color.blue())
+
+    view = PaginatorView(interaction.user.id, list(user_id_map), render_page)
+    await interaction.response.send_message(embed=view.embed(), view=view, ephemeral=True)
 
 # -----------------------------------
 # 📌 Slash Command to Fetch Player Profile
@@ -1061,28 +3309,25 @@ async def profile(interaction: discord.Interaction, member: discord.Member):
         await interaction.response.send_message(f"⚠ **{member.display_name}** is not mapped to a game ID. Use `/add_game_id` to add them.", ephemeral=True)
         return
     
-    game_id = user_id_map[str(member.id)]
-    data = fetch_game_profile(game_id)
-
-    if not data or data["code"] != 0:
-        await interaction.response.send_message(f"❌ Failed to retrieve profile for **{member.display_name}**.", ephemeral=True)
-        return
+    game_id = str(user_id_map[str(member.id)])
+    profile_data = roster.get(game_id)  # Kept fresh by sync_roster
+    if profile_data is None:
+        # Mapped since the last sync: fetch now
+        if game_id not in player_info_cache:
+            await interaction.response.defer(thinking=True)  # The player API may need retries
+        data = await player_info_cache.get(game_id)
+
+        if not data or data.get("code") != 0:
+            message = f"❌ Failed to retrieve profile for **{member.display_name}**."
+            if interaction.response.is_done():
+                await interaction.followup.send(message, ephemeral=True)
+            else:
+                await interaction.response.send_message(message, ephemeral=True)
+            return
+        update_roster(game_id, data)
+        profile_data = roster[game_id]
 
-    profile_data = data["data"]
-    level_mapping = {
-        31: "30-1", 32: "30-2", 33: "30-3", 34: "30-4",
-        35: "FC 1", 36: "FC 1 - 1", 37: "FC 1 - 2", 38: "FC 1 - 3", 39: "FC 1 - 4",
-        40: "FC 2", 41: "FC 2 - 1", 42: "FC 2 - 2", 43: "FC 2 - 3", 44: "FC 2 - 4",
-        45: "FC 3", 46: "FC 3 - 1", 47: "FC 3 - 2", 48: "FC 3 - 3", 49: "FC 3 - 4",
-        50: "FC 4", 51: "FC 4 - 1", 52: "FC 4 - 2", 53: "FC 4 - 3", 54: "FC 4 - 4",
-        55: "FC 5", 56: "FC 5 - 1", 57: "FC 5 - 2", 58: "FC 5 - 3", 59: "FC 5 - 4",
-        60: "FC 6", 61: "FC 6 - 1", 62: "FC 6 - 2", 63: "FC 6 - 3", 64: "FC 6 - 4",
-        65: "FC 7", 66: "FC 7 - 1", 67: "FC 7 - 2", 68: "FC 7 - 3", 69: "FC 7 - 4",
-        70: "FC 8", 71: "FC 8 - 1", 72: "FC 8 - 2", 73: "FC 8 - 3", 74: "FC 8 - 4",
-        75: "FC 9", 76: "FC 9 - 1", 77: "FC 9 - 2", 78: "FC 9 - 3", 79: "FC 9 - 4",
-        80: "FC 10", 81: "FC 10 - 1", 82: "FC 10 - 2", 83: "FC 10 - 3", 84: "FC 10 - 4"
-    }
-    stove_level = level_mapping.get(profile_data["stove_lv"], profile_data["stove_lv"])
+    stove_level = LEVEL_MAPPING.get(profile_data["stove_lv"], profile_data["stove_lv"])
     embed = discord.Embed(
         title=f"🎮 {profile_data['nickname']}'s Game Profile",
         color=discord.Color.blue()
@@ -1091,8 +3336,12 @@ async def profile(interaction: discord.Interaction, member: discord.Member):
     embed.add_field(name="🔥 Stove Level", value=f"`{stove_level}`", inline=True)
     embed.set_thumbnail(url=profile_data["avatar_image"])
     embed.set_footer(text="Whiteout Survival Player Profile")
+    embed.timestamp = datetime.fromtimestamp(profile_data["synced_at"])  # When this data was fetched
 
-    await interaction.response.send_message(embed=embed)
+    if interaction.response.is_done():
+        await interaction.followup.send(embed=embed)
+    else:
+        await interaction.response.send_message(embed=embed)
 # ---------------------------
 # Slash Command to Like a Member's Profile
 # ---------------------------
@@ -1108,30 +3357,14 @@ async def like_command(interaction: discord.Interaction, member: discord.Member)
     liker_id = str(interaction.user.id)
     likee_id = str(member.id)
     
-    if likee_id not in likes_cache:
-        likes_cache[likee_id] = []
-    
-    if liker_id in likes_cache[likee_id]:
+    if not like_member(liker_id, likee_id, interaction.guild_id):
         await interaction.response.send_message(f"You have already liked {member.display_name}'s profile.")
         logging.info(f"{interaction.user.display_name} attempted to like {member.display_name}'s profile again.")
         return
     
-    likes_cache[likee_id].append(liker_id)
-    save_cache()
     await interaction.response.send_message(f"{interaction.user.display_name} liked {member.display_name}'s profile! ❤️")
     logging.info(f"{interaction.user.display_name} liked {member.display_name}'s profile.")
-    
-    if likee_id in likes_cache.get(liker_id, []):
-        likee_member = interaction.guild.get_member(int(likee_id))
-        liker_member = interaction.guild.get_member(int(liker_id))
-        if likee_member and liker_member:
-            try:
-                await likee_member.send(f"🎉 You have a new match! {interaction.user.display_name} liked your profile and you liked theirs.")
-                await liker_member.send(f"🎉 You have a new match! {member.display_name} liked your profile and you liked theirs.")
-                logging.info(f"Notified {likee_member.display_name} of a new match with {interaction.user.display_name}.")
-                logging.info(f"Notified {liker_member.display_name} of a new match with {member.display_name}.")
-            except Exception as e:
-                logging.error(f"Failed to send DM to {likee_member.display_name}: {e}")
+    # A new mutual match is DMed to both members by the match notifier
 # ---------------------------
 # Slash Command to Unlike a Member's Profile
 # ---------------------------
@@ -1147,20 +3380,10 @@ async def unlike_command(interaction: discord.Interaction, member: discord.Membe
     liker_id = str(interaction.user.id)
     likee_id = str(member.id)
     
-    if liker_id in likes_cache.get(likee_id, []):
-        likes_cache[likee_id].remove(liker_id)
-        save_cache()
+    # A broken mutual match is DMed to the other member by the match notifier
+    if unlike_member(liker_id, likee_id, interaction.guild_id):
         await interaction.response.send_message(f"{interaction.user.display_name} unliked {member.display_name}'s profile.")
         logging.info(f"{interaction.user.display_name} unliked {member.display_name}'s profile.")
-        
-        if likee_id in likes_cache.get(liker_id, []):
-            likee_member = interaction.guild.get_member(int(likee_id))
-            if likee_member:
-                try:
-                    await likee_member.send(f"💔 {interaction.user.display_name} has unliked your profile. Your match is no longer mutual.")
-                    logging.info(f"Notified {likee_member.display_name} of the broken match with {interaction.user.display_name}.")
-                except Exception as e:
-                    logging.error(f"Failed to send DM to {likee_member.display_name}: {e}")
     else:
         await interaction.response.send_message(f"You have not liked {member.display_name}'s profile.")
         logging.info(f"{interaction.user.display_name} attempted to unlike {member.display_name}'s profile without a prior like.")
@@ -1171,24 +3394,23 @@ async def unlike_command(interaction: discord.Interaction, member: discord.Membe
 @tree.command(name="likes", description="View who has liked your dating profile")
 async def likes_command(interaction: discord.Interaction):
     member_id = str(interaction.user.id)
-    likers_ids = [user_id for user_id in likes_cache if member_id in likes_cache[user_id]]
+    likers_ids = get_likers(member_id)
     
     if not likers_ids:
         await interaction.response.send_message("No one has liked your profile yet.")
         return
     
-    likers = [interaction.guild.get_member(int(liker_id)) for liker_id in likers_ids]
-    likers = [member for member in likers if member]  # Filter out None values
-    
-    description = "\n".join([member.mention for member in likers])
+    def render_page(page_ids):
+        embed = discord.Embed(
+            title=f"❤️ Likes for {interaction.user.display_name}",
+            description="\n".join(f"<@{liker_id}>" for liker_id in page_ids),  # Mentions need no member lookup
+            color=discord.Color.red()
+        )
+        embed.set_thumbnail(url=interaction.user.avatar.url if interaction.user.avatar else "https://via.placeholder.com/128")
+        return embed
     
-    embed = discord.Embed(
-        title=f"❤️ Likes for {interaction.user.display_name}",
-        description=description,
-        color=discord.Color.red()
-    )
-    embed.set_thumbnail(url=interaction.user.avatar.url if interaction.user.avatar else "https://via.placeholder.com/128")
-    await interaction.response.send_message(embed=embed)
+    view = PaginatorView(interaction.user.id, likers_ids, render_page)
+    await interaction.response.send_message(embed=view.embed(), view=view)
 
 
 # ---------------------------
@@ -1197,7 +3419,7 @@ async def likes_command(interaction: discord.Interaction):
 @tree.command(name="mymatches", description="View your mutual matches")
 async def mymatches_command(interaction: discord.Interaction):
     member_id = str(interaction.user.id)
-    matches_ids = [user_id for user_id in likes_cache.get(member_id, []) if member_id in likes_cache.get(user_id, [])]
+    matches_ids = get_matches(member_id)
     
     if not matches_ids:
         await interaction.response.send_message("You have no matches yet.")
@@ -1220,14 +3442,17 @@ async def mymatches_command(interaction: discord.Interaction):
 # ---------------------------
 # Slash Command to Find Potential Matches
 # ---------------------------
-@tree.command(name="findmatches", description="Find random potential matches")
+@tree.command(name="findmatches", description="Find your most compatible potential matches")
 async def findmatches_command(interaction: discord.Interaction):
-    all_profiles = list(profile_cache.values())
-    
-    if len(all_profiles) < 5:
-        potential_matches = all_profiles  # Show all if less than 5 exist
-    else:
-        potential_matches = random.sample(all_profiles, 5)  # Pick 5 random profiles
+    member_id = str(interaction.user.id)
+    # Never suggest yourself or someone you already liked or matched with
+    exclude = {member_id} | like_graph.liked_by(member_id) | mutual_matches.get(member_id, set())
+    # People co-liked with the ones you liked rank higher
+    boost = {other_id: CO_LIKE_WEIGHT * score for other_id, score in co_like_scores(member_id).items()}
+    potential_matches = [
+        (profile_cache[other_id], similarity)
+        for other_id, similarity in match_recommender.recommend(member_id, exclude, 5, boost=boost)
+    ]
     
     if not potential_matches:
         await interaction.response.send_message("No potential matches found at the moment.")
@@ -1238,20 +3463,41 @@ async def findmatches_command(interaction: discord.Interaction):
         color=discord.Color.gold()
     )
     
-    for profile in potential_matches:
+    for profile, similarity in potential_matches:
+        compatibility = f"\n💞 **Compatibility:** {max(similarity, 0):.0%}" if similarity is not None else ""
         embed.add_field(
             name=f"{profile['name']}",
-            value=f"💡 **Dating me is like:** {profile['dating_me_like']}\n💼 **Job:** {profile['job']}\n🎂 **Age:** {profile['age']}",
+            value=f"💡 **Dating me is like:** {profile['dating_me_like']}\n💼 **Job:** {profile['job']}\n🎂 **Age:** {profile['age']}{compatibility}",
             inline=False
         )
     
     await interaction.response.send_message(embed=embed)
 
+@tree.command(name="alsoliked", description="See who the people that liked a member also liked")
+async def alsoliked_command(interaction: discord.Interaction, member: discord.Member):
+    suggestions = also_liked(str(member.id), 5)
+    
+    if not suggestions:
+        await interaction.response.send_message(f"Nobody who liked {member.display_name} has liked anyone else yet.")
+        return
+    
+    description = ""
+    for other_id, count in suggestions:
+        other = interaction.guild.get_member(int(other_id))
+        if other:
+            description += f"{other.mention} - liked by {count} of the same people\n"
+    
+    embed = discord.Embed(
+        title=f"👥 People who liked {member.display_name} also liked",
+        description=description or "They are no longer in this server.",
+        color=discord.Color.purple()
+    )
+    await interaction.response.send_message(embed=embed)
+
 # ---------------------------
 # Command to show bot instructions
 # ---------------------------
-@tree.command(name="help", description="Show bot instructions")
-async def help_command(interaction: discord.Interaction):
+def build_help_embed():
     embed = discord.Embed(
         title="📖 Bot Instructions",
         description="Welcome to the Discord Matchmaking & Event Scheduler Bot! Here's how you can interact with me:",
@@ -1354,7 +3600,12 @@ async def help_command(interaction: discord.Interaction):
     )
     embed.add_field(
         name="🔍 **/findmatches**",
-        value="Find potential matches based on existing likes.",
+        value="Find the most compatible profiles you haven't liked yet.",
+        inline=False
+    )
+    embed.add_field(
+        name="👥 **/alsoliked @User**",
+        value="See who the people that liked a member also liked.",
         inline=False
     )
 
@@ -1369,10 +3620,21 @@ async def help_command(interaction: discord.Interaction):
         value="View the top profiles ranked by likes. Default is 5.",
         inline=False
     )
+    embed.add_field(
+        name="🔥 **/alliance [view] [minimum]**",
+        value="View the alliance roster: `top` stove levels (optionally from a `minimum` such as FC 5), `levels` distribution or recent `upgrades`.",
+        inline=False
+    )
 
     embed.set_footer(text="Use these commands to interact with the bot and enhance your Discord experience!")
 
-    await interaction.response.send_message(embed=embed)  # ✅ Sends the embed message
+    return embed
+
+help_embed = build_help_embed()  # Static, so it is built once at startup
+
+@tree.command(name="help", description="Show bot instructions")
+async def help_command(interaction: discord.Interaction):
+    await interaction.response.send_message(embed=help_embed)  # ✅ Sends the embed message
 
 
 
@@ -1386,19 +3648,13 @@ async def toplikes_command(interaction: discord.Interaction, number: int = 5):
         await interaction.response.send_message("Please enter a positive number.")
         return
     
-    # Calculate like counts
-    like_counts = {member_id: len(likers) for member_id, likers in likes_cache.items()}
-    
-    # Sort members by like counts in descending order
-    sorted_likes = sorted(like_counts.items(), key=lambda item: item[1], reverse=True)
+    # Most liked members, already sorted and limited
+    sorted_likes = top_liked(number)
     
     if not sorted_likes:
         await interaction.response.send_message("No profiles have been liked yet.")
         return
     
-    # Limit the number of top profiles
-    sorted_likes = sorted_likes[:number]
-    
     description = ""
     for idx, (member_id, count) in enumerate(sorted_likes, start=1):
         member = interaction.guild.get_member(int(member_id))  # ✅ Fix ctx.guild -> interaction.guild
@@ -1411,10 +3667,90 @@ async def toplikes_command(interaction: discord.Interaction, number: int = 5):
         color=discord.Color.gold()
     )
     embed.set_thumbnail(url="https://via.placeholder.com/128")  # Optional: Use a trophy icon or relevant image
+    rank = like_leaderboard.rank(str(interaction.user.id))
+    if rank:
+        count = like_leaderboard.counts[str(interaction.user.id)]
+        embed.set_footer(text=f"Your rank: #{rank} with {count} like{'s' if count != 1 else ''}")
     
     await interaction.response.send_message(embed=embed)  # ✅ Fix ctx.send -> interaction.response.send_message
 
 
+# ---------------------------
+# Slash Command to View the Alliance Roster
+# ---------------------------
+@tree.command(name="alliance", description="View the alliance roster ranked by stove level")
+@discord.app_commands.describe(
+    view="'top' (highest stove levels), 'levels' (players per level) or 'upgrades' (recently upgraded)",
+    minimum="(For 'top') Only list players at or above this level, e.g. 'FC 5' or '30'"
+)
+async def alliance_command(interaction: discord.Interaction, view: str = "top", minimum: str = None):
+    # Served from roster_index, which sync_roster keeps up to date; no API calls here
+    view = view.lower()
+    if not roster_index.keys:
+        await interaction.response.send_message("ℹ The roster is empty. Map players with `/add_game_id` and wait for the next sync.", ephemeral=True)
+        return
+
+    if view == "levels":
+        lines = [
+            f"🔥 **{LEVEL_MAPPING.get(stove_lv, stove_lv)}**: {count} player{'s' if count != 1 else ''}"
+            for stove_lv, count in sorted(roster_index.level_counts.items(), reverse=True)
+        ]
+        embed = discord.Embed(title="📊 Alliance Stove Levels", description="\n".join(lines), color=discord.Color.blue())
+        embed.set_footer(text=f"{len(roster_index.keys)} players")
+        await interaction.response.send_message(embed=embed)
+        return
+
+    if view == "top":
+        entries = roster_index.by_level
+        title = "🏆 Alliance Stove Levels"
+        if minimum:
+            stove_lv = parse_stove_level(minimum)
+            if stove_lv is None:
+                await interaction.response.send_message(f"❌ Unknown level `{minimum}`. Use a level like `FC 5` or `30`.", ephemeral=True)
+                return
+            entries = roster_index.at_least(stove_lv)
+            title = f"🏆 Players at {LEVEL_MAPPING.get(stove_lv, stove_lv)} or Above"
+            if not entries:
+                await interaction.response.send_message(f"ℹ Nobody is at {LEVEL_MAPPING.get(stove_lv, stove_lv)} or above yet.")
+                return
+
+        def render_page(page):
+            lines = [
+                f"{rank}. **{roster[fid]['nickname']}** - {LEVEL_MAPPING.get(-neg_level, -neg_level)}"
+                for rank, (neg_level, _, fid) in page
+                if fid in roster_index.keys  # Skip players dropped since the list was opened
+            ]
+            return discord.Embed(title=title, description="\n".join(lines), color=discord.Color.gold())
+
+        paginator = PaginatorView(interaction.user.id, list(enumerate(entries, start=1)), render_page)
+        await interaction.response.send_message(embed=paginator.embed(), view=paginator)
+        return
+
+    if view == "upgrades":
+        if not roster_index.by_upgrade:
+            await interaction.response.send_message("ℹ No upgrades have been recorded yet.")
+            return
+
+        def render_page(page):
+            lines = []
+            for neg_upgraded_at, fid in page:
+                if fid not in roster_index.keys:
+                    continue
+                history = roster[fid]["history"]
+                before, after = history[-2][1], history[-1][1]
+                lines.append(
+                    f"⬆ **{roster[fid]['nickname']}**: {LEVEL_MAPPING.get(before, before)} → "
+                    f"{LEVEL_MAPPING.get(after, after)} <t:{-neg_upgraded_at}:R>"
+                )
+            return discord.Embed(title="⬆ Recently Upgraded", description="\n".join(lines), color=discord.Color.green())
+
+        paginator = PaginatorView(interaction.user.id, list(roster_index.by_upgrade), render_page)
+        await interaction.response.send_message(embed=paginator.embed(), view=paginator)
+        return
+
+    await interaction.response.send_message("❌ Invalid view. Use `top`, `levels` or `upgrades`.", ephemeral=True)
+
+
 # Handle command errors gracefully
 @bot.event
 async def on_command_error(ctx, error):
@@ -1428,13 +3764,24 @@ async def on_command_error(ctx, error):
         logging.error(f'An error occurred: {error}')
         await ctx.send("An unexpected error occurred. Please try again later.")
 
+# Slash command checks fail here rather than in on_command_error
+@tree.error
+async def on_app_command_error(interaction: discord.Interaction, error: discord.app_commands.AppCommandError):
+    if isinstance(error, discord.app_commands.MissingPermissions):
+        message = "You don't have the required permissions to use this command."
+    else:
+        logging.error(f"An error occurred in /{interaction.command.name if interaction.command else '?'}: {error}")
+        message = "An unexpected error occurred. Please try again later."
+    if interaction.response.is_done():
+        await interaction.followup.send(message, ephemeral=True)
+    else:
+        await interaction.response.send_message(message, ephemeral=True)
+
 # Save cache on shutdown
 @bot.event
 async def on_disconnect():
-    save_likes_cache()
-    with open(CACHE_FILE, "w") as f:
-        json.dump(profile_cache, f, indent=4)
-    logging.info("Profile and likes cache saved on disconnect.")
+    await flush_all_stores()
+    logging.info("Pending changes flushed on disconnect.")
 
 # ---------------------------
 # Running Flask and Discord Bot
@@ -1446,8 +3793,10 @@ def keep_alive():
 def run_flask():
     app.run(host='0.0.0.0', port=7123)
 
-# Start the web server before running the bot
-keep_alive()
+# Only when run as a script, so benchmarks/ can import the module
+if __name__ == "__main__":
+    # Start the web server before running the bot
+    keep_alive()
 
-# Run the Discord bot
-bot.run(TOKEN)
\ No newline at end of file
+    # Run the Discord bot
+    bot.run(TOKEN)
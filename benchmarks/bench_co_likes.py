@@ -0,0 +1,87 @@
+"""Build time and memory of the co-like matrix, and the cost of keeping it up to date.
+
+    python benchmarks/bench_co_likes.py --members 1000 5000 10000 --likes 20
+"""
+import argparse
+import asyncio
+import random
+import time
+import tracemalloc
+
+from common import load_bot, print_table, time_per_call
+
+def random_like_graph(bot, members, likes, rng):
+    graph = bot.LikeGraph()
+    member_ids = [str(100000 + index) for index in range(members)]
+    for liker_id in member_ids:
+        for likee_id in rng.sample(member_ids, likes):
+            if likee_id != liker_id:
+                graph.add(liker_id, likee_id)
+    return graph, member_ids
+
+async def rebuild_stall(bot):
+    """Longest event loop stall while rebuild_co_likes builds in its worker thread, in seconds."""
+    stalls = [0.0]
+    running = True
+
+    async def heartbeat():
+        while running:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls[0] = max(stalls[0], time.perf_counter() - before - 0.01)
+
+    ticker = asyncio.create_task(heartbeat())
+    await bot.rebuild_co_likes.coro()
+    running = False
+    await ticker
+    return stalls[0]
+
+def measure(bot, members, likes, rng):
+    graph, member_ids = random_like_graph(bot, members, likes, rng)
+    liked_sets = [set(liked) for liked in graph.liked.values() if len(liked) > 1]
+
+    started = time.perf_counter()
+    matrix = bot.build_co_likes(liked_sets)
+    build_seconds = time.perf_counter() - started
+    # Built a second time for memory, since tracing slows the build down
+    tracemalloc.start()
+    bot.build_co_likes(liked_sets)
+    peak_bytes = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    # One like and its unlike, the way record_co_like_change applies them
+    changes = []
+    for _ in range(200):
+        liker_id = rng.choice(member_ids)
+        likee_id = rng.choice(member_ids)
+        others = [other_id for other_id in graph.liked_by(liker_id) if other_id != likee_id]
+        changes += [(matrix, likee_id, others, 1), (matrix, likee_id, others, -1)]
+    update_seconds = time_per_call(bot.apply_co_like_change, changes)
+
+    bot.like_graph, bot.co_likes = graph, matrix
+    lookup_seconds = time_per_call(bot.also_liked, [(rng.choice(member_ids),) for _ in range(1000)])
+    stall_seconds = asyncio.run(rebuild_stall(bot))
+
+    return (
+        f"{members:,}", f"{sum(len(row) for row in matrix.values()):,}", f"{build_seconds:.2f}",
+        f"{peak_bytes / 2**20:.1f}", f"{bot.co_like_matrix_size(matrix) / 2**20:.1f}",
+        f"{update_seconds * 1e6:.1f}", f"{lookup_seconds * 1e6:.1f}", f"{stall_seconds * 1000:.0f}",
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, nargs="+", default=[1000, 5000, 10000])
+    parser.add_argument("--likes", type=int, default=20, help="likes given per member")
+    args = parser.parse_args()
+
+    bot = load_bot()
+    rng = random.Random(42)
+    rows = [measure(bot, members, args.likes, rng) for members in args.members]
+    print(f"{args.likes} likes per member")
+    print_table(
+        ("members", "entries", "build (s)", "build peak (MiB)", "matrix (MiB)", "update (us)", "also_liked (us)", "rebuild loop stall (ms)"),
+        rows
+    )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Profile generation throughput against a local mock of the Groq completions endpoint.
+
+Compares the async client with a blocking call made from the event loop, which is
+what the old requests.post did, and reports how long the loop stalled.
+
+    python benchmarks/bench_groq_client.py --requests 50 --latency-ms 200
+"""
+import argparse
+import asyncio
+import json
+import socket
+import threading
+import time
+import urllib.request
+
+from aiohttp import web
+
+from common import load_bot, print_table
+
+PROFILE = {
+    "name": "Bench", "dating_me_like": "a benchmark", "way_to_heart": "low latency", "known_for": "speed",
+    "spontaneous_thing": "a load test", "geek_out_on": "profilers", "age": 30, "job": "tester", "funny_fact": "none",
+}
+
+def start_mock_server(latency):
+    """Runs the mock endpoint on its own thread and loop, so a blocking client cannot stall it."""
+    async def completions(request):
+        await request.read()
+        await asyncio.sleep(latency)
+        return web.json_response({"choices": [{"message": {"content": json.dumps(PROFILE)}}]})
+
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        port = probe.getsockname()[1]
+
+    started = threading.Event()
+
+    def serve():
+        loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_post("/v1/chat/completions", completions)
+        runner = web.AppRunner(app)
+        loop.run_until_complete(runner.setup())
+        loop.run_until_complete(web.TCPSite(runner, "127.0.0.1", port).start())
+        started.set()
+        loop.run_forever()
+
+    threading.Thread(target=serve, daemon=True).start()
+    started.wait()
+    return f"http://127.0.0.1:{port}/v1/chat/completions"
+
+def blocking_completion(url, prompt):
+    body = json.dumps({"model": "bench", "messages": [{"role": "user", "content": prompt}]}).encode()
+    request = urllib.request.Request(url, data=body, headers={"Content-Type": "application/json"})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())["choices"][0]["message"]["content"]
+
+async def measure(generate, count):
+    """(seconds for `count` concurrent generations, longest event loop stall in seconds)"""
+    stalls = [0.0]
+    running = True
+
+    async def heartbeat():
+        while running:
+            before = time.perf_counter()
+            await asyncio.sleep(0.01)
+            stalls[0] = max(stalls[0], time.perf_counter() - before - 0.01)
+
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.sleep(0.05)
+    started = time.perf_counter()
+    results = await asyncio.gather(*(generate(f"Member {index}") for index in range(count)))
+    elapsed = time.perf_counter() - started
+    running = False
+    await ticker
+    assert all(isinstance(result, dict) for result in results)
+    return elapsed, stalls[0]
+
+async def run(bot, url, count):
+    async def blocking_generate(member_name):
+        return bot.parse_profile_json(blocking_completion(url, f"Create a dating profile for {member_name}"))
+
+    rows = []
+    for name, generate in (("blocking (old)", blocking_generate), ("async client", bot.generate_profile_with_groq)):
+        elapsed, stall = await measure(generate, count)
+        rows.append((name, f"{elapsed:.2f}", f"{count / elapsed:.1f}", f"{stall * 1000:.0f}"))
+    await bot.http_session.close()
+    return rows
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--latency-ms", type=int, default=200, help="mock completion latency")
+    args = parser.parse_args()
+
+    url = start_mock_server(args.latency_ms / 1000)
+    bot = load_bot(GROQ_API_URL=url, GROQ_API_KEY="bench")
+    rows = asyncio.run(run(bot, url, args.requests))
+    print(f"{args.requests} concurrent generations, {args.latency_ms} ms mock latency")
+    print_table(("client", "total (s)", "profiles/s", "max loop stall (ms)"), rows)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+"""Like queries on the LikeGraph versus the list scans they replaced.
+
+    python benchmarks/bench_like_graph.py --members 10000 --likes 20
+"""
+import argparse
+import random
+
+from common import load_bot, print_table, time_per_call
+
+# The queries as they were answered from likes_cache ({ likee_id: [liker_id, ...] }) alone
+def old_likers(likes_cache, member_id):
+    # /likes
+    return [user_id for user_id in likes_cache if member_id in likes_cache[user_id]]
+
+def old_get_likes(likes_cache, profile_cache, member_id):
+    result = []
+    for user_id, profile in profile_cache.items():
+        if user_id != member_id and member_id in likes_cache.get(user_id, []):
+            result += [user_id]
+    return result
+
+def old_matches(likes_cache, member_id):
+    # /mymatches
+    return [user_id for user_id in likes_cache.get(member_id, []) if member_id in likes_cache.get(user_id, [])]
+
+def old_has_liked(likes_cache, liker_id, likee_id):
+    return liker_id in likes_cache.get(likee_id, [])
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--members", type=int, default=10000)
+    parser.add_argument("--likes", type=int, default=20, help="likes given per member")
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    bot = load_bot()
+    rng = random.Random(42)
+    members = [str(100000 + index) for index in range(args.members)]
+    likes_cache = {}
+    graph = bot.LikeGraph()
+    for liker_id in members:
+        for likee_id in rng.sample(members, args.likes):
+            if likee_id != liker_id and graph.add(liker_id, likee_id):
+                likes_cache.setdefault(likee_id, []).append(liker_id)
+    profile_cache = {member_id: {} for member_id in members}
+
+    sample = [(rng.choice(members),) for _ in range(args.queries)]
+    pairs = [(rng.choice(members), rng.choice(members)) for _ in range(args.queries)]
+    queries = [
+        ("likers (/likes)", lambda m: old_likers(likes_cache, m), lambda m: list(graph.likers_of(m)), sample),
+        ("get_likes", lambda m: old_get_likes(likes_cache, profile_cache, m), lambda m: list(graph.liked_by(m)), sample),
+        ("matches (/mymatches)", lambda m: old_matches(likes_cache, m), lambda m: list(graph.liked_by(m) & graph.likers_of(m)), sample),
+        ("has_liked", lambda a, b: old_has_liked(likes_cache, a, b), graph.has_liked, pairs),
+    ]
+
+    rows = []
+    for name, before, after, arguments in queries:
+        before_seconds = time_per_call(before, arguments)
+        after_seconds = time_per_call(after, arguments)
+        rows.append((name, f"{before_seconds * 1e6:,.1f}", f"{after_seconds * 1e6:,.2f}", f"{before_seconds / after_seconds:,.0f}x"))
+
+    total_likes = sum(len(likers) for likers in likes_cache.values())
+    print(f"{args.members:,} members, {total_likes:,} likes, {args.queries} queries each")
+    print_table(("query", "list scan (us)", "like graph (us)", "speedup"), rows)
+
+if __name__ == "__main__":
+    main()
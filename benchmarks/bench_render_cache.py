@@ -0,0 +1,55 @@
+"""Per-command render cost with the render cache versus rebuilding everything per call.
+
+    python benchmarks/bench_render_cache.py --calls 10000
+"""
+import argparse
+
+from common import load_bot, print_table, time_per_call
+
+class FakeMember:
+    def __init__(self, member_id, display_name):
+        self.id = member_id
+        self.display_name = display_name
+        self.avatar = None
+
+def literal_builder(table):
+    """A function that builds `table` from a dict literal on every call, as the commands used to."""
+    return eval(f"lambda: {table!r}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--calls", type=int, default=10000)
+    args = parser.parse_args()
+
+    bot = load_bot()
+    member = FakeMember(123456789, "Bench")
+    bot.profile_cache[str(member.id)] = {
+        "name": "Bench", "dating_me_like": "a benchmark", "way_to_heart": "low latency", "known_for": "speed",
+        "spontaneous_thing": "a load test", "geek_out_on": "profilers", "age": "30", "job": "tester", "funny_fact": "none",
+    }
+
+    def uncached_profile_embed(member):
+        bot.profile_embeds.clear()
+        return bot.profile_embed(member)
+
+    build_level_mapping = literal_builder(bot.LEVEL_MAPPING)
+    build_field_emojis = literal_builder(bot.PROFILE_FIELD_TITLES)
+    cases = [
+        ("/help embed", bot.build_help_embed, lambda: bot.help_embed, ()),
+        ("/profile card", uncached_profile_embed, bot.profile_embed, (member,)),
+        ("/profile field titles", lambda key: build_field_emojis()[key], bot.PROFILE_FIELD_TITLES.get, ("known_for",)),
+        ("/profile_mapped level", lambda level: build_level_mapping().get(level), bot.LEVEL_MAPPING.get, (57,)),
+    ]
+
+    rows = []
+    for name, before, after, call_args in cases:
+        arguments = [call_args] * args.calls
+        before_seconds = time_per_call(before, arguments)
+        after_seconds = time_per_call(after, arguments)
+        rows.append((name, f"{before_seconds * 1e6:.2f}", f"{after_seconds * 1e6:.2f}", f"{before_seconds / after_seconds:.0f}x"))
+
+    print(f"{args.calls:,} calls each")
+    print_table(("render", "per call (us)", "cached (us)", "speedup"), rows)
+
+if __name__ == "__main__":
+    main()
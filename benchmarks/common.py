@@ -0,0 +1,33 @@
+"""Shared setup for the benchmarks: loads the bot module without connecting to Discord."""
+import importlib.util
+import logging
+import os
+import tempfile
+import time
+
+BOT_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "Whiteout-Survival.py")
+
+def load_bot(**env):
+    """Imports Whiteout-Survival.py from a scratch directory, so its data files stay out of the repo.
+
+    Keyword arguments are set as environment variables first, e.g. PROFILE_BATCH_SIZE=4.
+    """
+    os.environ.update({key: str(value) for key, value in env.items()})
+    os.chdir(tempfile.mkdtemp(prefix="bot-bench-"))
+    spec = importlib.util.spec_from_file_location("whiteout_survival", BOT_FILE)
+    bot = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(bot)
+    logging.disable(logging.WARNING)  # The bot logs every call at INFO
+    return bot
+
+def time_per_call(function, arguments):
+    """Average seconds per call of `function` over a list of argument tuples."""
+    started = time.perf_counter()
+    for args in arguments:
+        function(*args)
+    return (time.perf_counter() - started) / len(arguments)
+
+def print_table(headers, rows):
+    widths = [max(len(str(cell)) for cell in column) for column in zip(headers, *rows)]
+    for row in [headers, *rows]:
+        print("  ".join(str(cell).ljust(width) for cell, width in zip(row, widths)))